@@ -0,0 +1,35 @@
+"""Secondary indexes for service queries
+
+Revision ID: 202610181000
+Revises: 202610180900
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "202610181000"
+down_revision = "202610180900"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CreditsService.get_user_credits: credits by user, payments summed per credit and type
+    op.create_index("ix_credits_user_id", "credits", ["user_id"])
+    op.create_index("ix_payments_credit_type_sum", "payments", ["credit_id", "type_id", "sum"])
+    # reporting services: date range scans covering the summed column
+    op.create_index("ix_credits_issuance_date_body", "credits", ["issuance_date", "body"])
+    op.create_index("ix_payments_date_sum", "payments", ["payment_date", "sum"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_payments_date_sum", table_name="payments")
+    op.drop_index("ix_credits_issuance_date_body", table_name="credits")
+    # MySQL drops the implicit foreign key indexes once the composite ones exist,
+    # so restore them before dropping the indexes that now back the constraints.
+    op.create_index("credit_id", "payments", ["credit_id"])
+    op.drop_index("ix_payments_credit_type_sum", table_name="payments")
+    op.create_index("user_id", "credits", ["user_id"])
+    op.drop_index("ix_credits_user_id", table_name="credits")
@@ -0,0 +1,45 @@
+"""Daily issuance and payment rollups
+
+Revision ID: 202610181100
+Revises: 202610181000
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "202610181100"
+down_revision = "202610181000"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "daily_issuance_totals",
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("issuance_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("issuance_sum", sa.Numeric(16, 2), nullable=False, server_default="0"),
+    )
+    op.create_table(
+        "daily_payment_totals",
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("payment_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("payment_sum", sa.Numeric(16, 2), nullable=False, server_default="0"),
+    )
+
+    op.execute(
+        "INSERT INTO daily_issuance_totals (day, issuance_count, issuance_sum) "
+        "SELECT issuance_date, COUNT(*), SUM(body) FROM credits GROUP BY issuance_date"
+    )
+    op.execute(
+        "INSERT INTO daily_payment_totals (day, payment_count, payment_sum) "
+        "SELECT payment_date, COUNT(*), SUM(sum) FROM payments GROUP BY payment_date"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("daily_payment_totals")
+    op.drop_table("daily_issuance_totals")
@@ -0,0 +1,39 @@
+"""Denormalized payment balances on credits
+
+Revision ID: 202610181200
+Revises: 202610181100
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "202610181200"
+down_revision = "202610181100"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("credits", sa.Column("body_paid", sa.Numeric(12, 2), nullable=False, server_default="0"))
+    op.add_column("credits", sa.Column("percent_paid", sa.Numeric(12, 2), nullable=False, server_default="0"))
+    op.add_column("credits", sa.Column("last_payment_date", sa.Date(), nullable=True))
+
+    op.execute(
+        "UPDATE credits c JOIN ("
+        "  SELECT credit_id,"
+        "    SUM(CASE WHEN type_id = 1 THEN sum ELSE 0 END) AS body_paid,"
+        "    SUM(CASE WHEN type_id = 2 THEN sum ELSE 0 END) AS percent_paid,"
+        "    MAX(payment_date) AS last_payment_date"
+        "  FROM payments GROUP BY credit_id"
+        ") p ON p.credit_id = c.id "
+        "SET c.body_paid = p.body_paid, c.percent_paid = p.percent_paid, c.last_payment_date = p.last_payment_date"
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("credits", "last_payment_date")
+    op.drop_column("credits", "percent_paid")
+    op.drop_column("credits", "body_paid")
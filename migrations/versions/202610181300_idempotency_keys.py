@@ -0,0 +1,32 @@
+"""Idempotency keys for bulk ingestion
+
+Revision ID: 202610181300
+Revises: 202610181200
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "202610181300"
+down_revision = "202610181200"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "idempotency_keys",
+        sa.Column("key", sa.String(length=100), primary_key=True),
+        sa.Column("endpoint", sa.String(length=50), primary_key=True),
+        sa.Column("chunk", sa.Integer(), primary_key=True),
+        sa.Column("payload_hash", sa.String(length=64), nullable=False),
+        sa.Column("rows", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("idempotency_keys")
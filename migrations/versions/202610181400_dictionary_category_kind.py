@@ -0,0 +1,35 @@
+"""Dictionary category kinds
+
+Revision ID: 202610181400
+Revises: 202610181300
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "202610181400"
+down_revision = "202610181300"
+branch_labels = None
+depends_on = None
+
+# the shipped categories; dictionary.name compares case-insensitively
+CATEGORY_KINDS = {
+    "тіло": "body",
+    "відсотки": "percent",
+    "видача": "issuance",
+    "збір": "collection",
+}
+
+
+def upgrade() -> None:
+    op.add_column("dictionary", sa.Column("category_kind", sa.String(length=20), nullable=True))
+    dictionary = sa.table("dictionary", sa.column("name", sa.String), sa.column("category_kind", sa.String))
+    for name, kind in CATEGORY_KINDS.items():
+        op.execute(dictionary.update().where(dictionary.c.name == name).values(category_kind=kind))
+
+
+def downgrade() -> None:
+    op.drop_column("dictionary", "category_kind")
@@ -0,0 +1,25 @@
+"""Index for the portfolio aging report
+
+Revision ID: 202610181500
+Revises: 202610181400
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "202610181500"
+down_revision = "202610181400"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # credits open at a date (actual_return_date NULL or later) are a range of this index,
+    # and their bucket (return_date) and issuance_date filter are read from it
+    op.create_index("ix_credits_actual_return_date", "credits", ["actual_return_date", "return_date", "issuance_date"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_credits_actual_return_date", table_name="credits")
@@ -0,0 +1,29 @@
+"""Owner and heartbeat of plan import jobs
+
+Revision ID: 202610181700
+Revises: 202610181600
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "202610181700"
+down_revision = "202610181600"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("plan_import_jobs", sa.Column("owner", sa.String(length=64), nullable=True))
+    # jobs left queued/running by earlier versions have no heartbeat and are failed as stale
+    op.add_column("plan_import_jobs", sa.Column("heartbeat_at", sa.DateTime(), nullable=True))
+    op.create_index("ix_plan_import_jobs_status_heartbeat", "plan_import_jobs", ["status", "heartbeat_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_plan_import_jobs_status_heartbeat", table_name="plan_import_jobs")
+    op.drop_column("plan_import_jobs", "heartbeat_at")
+    op.drop_column("plan_import_jobs", "owner")
@@ -0,0 +1,169 @@
+"""
+Drive the API in-process (httpx ASGI transport, no network) against the configured
+database and report latency, throughput and SQL statements per request per endpoint.
+
+Usage:
+    python -m scripts.bench_endpoints --requests 500 --concurrency 16 --output results.json
+
+Load a dataset first (scripts.generate_dataset + scripts.seed_from_csv --data-dir).
+Parameters are drawn from the data: random user ids for /user_credits, random dates
+in the issuance range for /plans/performance, the covered years for
+/plans/year_performance. --no-cache disables the report cache and the coalescing of
+concurrent identical reports, so every report request reaches the database. The
+JSON output carries the same numbers plus the run settings and row counts, so runs
+on different revisions can be diffed.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+import httpx
+from sqlalchemy import event, func, select
+
+from scripts.bench_year_performance import percentile
+from src.core.cache import report_cache
+from src.core.config import get_settings
+from src.core.database import SessionLocal, engine
+from src.core.singleflight import report_flights
+from src.main import app
+from src.models import Credit, Payment, User
+
+
+async def dataset_params() -> dict:
+    async with SessionLocal() as session:
+        users = await session.scalar(select(func.count()).select_from(User))
+        credits = await session.scalar(select(func.count()).select_from(Credit))
+        payments = await session.scalar(select(func.count()).select_from(Payment))
+        max_user_id = await session.scalar(select(func.max(User.id))) or 1
+        first_issuance = await session.scalar(select(func.min(Credit.issuance_date))) or date.today()
+        last_issuance = await session.scalar(select(func.max(Credit.issuance_date))) or date.today()
+    return {
+        "rows": {"users": users, "credits": credits, "payments": payments},
+        "max_user_id": max_user_id,
+        "first_issuance": first_issuance,
+        "last_issuance": last_issuance,
+    }
+
+
+def endpoint_urls(params: dict, rng: random.Random) -> dict:
+    first, last = params["first_issuance"], params["last_issuance"]
+    days = (last - first).days
+    years = list(range(first.year, last.year + 1))
+    return {
+        "user_credits": lambda: f"/user_credits/{rng.randint(1, params['max_user_id'])}",
+        "plans_performance": lambda: (
+            f"/plans/performance?report_date={first + timedelta(days=rng.randint(0, days))}"
+        ),
+        "year_performance": lambda: f"/plans/year_performance?year={rng.choice(years)}",
+    }
+
+
+async def bench_endpoint(client: httpx.AsyncClient, make_url, requests: int, concurrency: int) -> dict:
+    prefix = get_settings().api_v1_prefix
+    statements = 0
+    errors = 0
+
+    def count(*_):
+        nonlocal statements
+        statements += 1
+
+    slots = asyncio.Semaphore(concurrency)
+
+    async def call() -> float:
+        nonlocal errors
+        async with slots:
+            started = time.perf_counter()
+            response = await client.get(prefix + make_url())
+            elapsed = time.perf_counter() - started
+        if response.status_code != 200:
+            errors += 1
+        return elapsed
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count)
+    started = time.perf_counter()
+    try:
+        samples = await asyncio.gather(*(call() for _ in range(requests)))
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", count)
+    wall = time.perf_counter() - started
+
+    return {
+        "requests": requests,
+        "errors": errors,
+        "p50_ms": round(percentile(samples, 50) * 1000, 3),
+        "p95_ms": round(percentile(samples, 95) * 1000, 3),
+        "p99_ms": round(percentile(samples, 99) * 1000, 3),
+        "mean_ms": round(statistics.mean(samples) * 1000, 3),
+        "rps": round(requests / wall, 1),
+        "sql_per_request": round(statements / requests, 2),
+    }
+
+
+async def run(endpoints: list[str], requests: int, concurrency: int, warmup: int, no_cache: bool, seed: int) -> dict:
+    if no_cache:
+        # every request computes its report: no cached result and no shared in-flight computation
+        report_cache.maxsize = 0
+        report_flights.enabled = False
+    params = await dataset_params()
+    urls = endpoint_urls(params, random.Random(seed))
+    headers = {"X-API-Key": get_settings().api_key}
+
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers) as client:
+        for name in endpoints:
+            for _ in range(warmup):
+                await client.get(get_settings().api_v1_prefix + urls[name]())
+            results[name] = await bench_endpoint(client, urls[name], requests, concurrency)
+            result = results[name]
+            print(
+                f"{name:<18} p50 {result['p50_ms']:8.2f} ms  p95 {result['p95_ms']:8.2f} ms  "
+                f"p99 {result['p99_ms']:8.2f} ms  {result['rps']:8.1f} rps  "
+                f"{result['sql_per_request']:5.1f} SQL/req  {result['errors']} errors"
+            )
+    await engine.dispose()
+
+    return {
+        "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "settings": {
+            "requests": requests,
+            "concurrency": concurrency,
+            "warmup": warmup,
+            "report_cache": not no_cache,
+            "seed": seed,
+        },
+        "rows": params["rows"],
+        "endpoints": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--endpoint",
+        action="append",
+        choices=["user_credits", "plans_performance", "year_performance"],
+        help="endpoint to run (repeatable; default all)",
+    )
+    parser.add_argument("--requests", type=int, default=500, help="requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--no-cache", action="store_true", help="disable the report cache and request coalescing")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", type=Path, help="write results as JSON to this file")
+    args = parser.parse_args()
+
+    endpoints = args.endpoint or ["user_credits", "plans_performance", "year_performance"]
+    results = asyncio.run(run(endpoints, args.requests, args.concurrency, args.warmup, args.no_cache, args.seed))
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+Microbenchmark of response serialization: FastAPI's default path against ModelJSONResponse.
+
+Usage:
+    python -m scripts.bench_serialization --rows 100000 --repeat 5
+
+Builds synthetic credits and year-performance items (no database) and times, per payload:
+  default    items built with validation, response_model re-validation + jsonable_encoder, JSONResponse
+  direct     items built with validation, ModelJSONResponse (pydantic-core to_json)
+  construct  items built with model_construct, ModelJSONResponse
+Prints the best of --repeat runs for building and for serializing, and fails if the paths
+produce different JSON. Then compares the wire formats of the year-performance payload:
+JSON, columnar JSON and MessagePack (if installed), each raw, gzipped and brotli-compressed
+(if installed) at the app's default levels.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Callable
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from pydantic import BaseModel
+
+from src.core.compression import brotli, brotli_encoder, gzip_encoder
+from src.core.config import get_settings
+from src.core.responses import ColumnarJSONResponse, ModelJSONResponse, MsgPackResponse, msgpack
+from src.schemas.responses import (
+    CreditClosedInfo,
+    CreditOpenInfo,
+    UserCreditsResponse,
+    YearPerformanceItem,
+    YearPerformanceResponse,
+)
+
+
+def credit_rows(count: int, rng: random.Random) -> list[dict]:
+    start = date(2020, 1, 1)
+    rows = []
+    for _ in range(count):
+        issuance = start + timedelta(days=rng.randrange(2000))
+        body = Decimal(rng.randrange(1000, 5_000_000)) / 100
+        row = {"issuance_date": issuance, "body": body, "percent": (body * Decimal("0.3")).quantize(Decimal("0.01"))}
+        if rng.random() < 0.6:
+            row |= {"is_closed": True, "actual_return_date": issuance + timedelta(days=30), "total_payments": body}
+        else:
+            row |= {
+                "is_closed": False,
+                "return_date": issuance + timedelta(days=90),
+                "overdue_days": rng.randrange(400),
+                "body_payments": body / 2,
+                "percent_payments": Decimal("0.00"),
+            }
+        rows.append(row)
+    return rows
+
+
+def month_rows(count: int, rng: random.Random) -> list[dict]:
+    return [
+        {
+            "month": index % 12 + 1,
+            "year": 2000 + index // 12 % 100,
+            "issuance_count": rng.randrange(10_000),
+            "issuance_plan_sum": Decimal(rng.randrange(10**9)) / 100,
+            "issuance_sum": Decimal(rng.randrange(10**9)) / 100,
+            "issuance_completion": round(rng.random() * 150, 2),
+            "payment_count": rng.randrange(10_000),
+            "payment_plan_sum": Decimal(rng.randrange(10**9)) / 100,
+            "payment_sum": Decimal(rng.randrange(10**9)) / 100,
+            "payment_completion": round(rng.random() * 150, 2),
+            "issuance_month_share": round(rng.random() * 100, 2),
+            "payment_month_share": round(rng.random() * 100, 2),
+        }
+        for index in range(count)
+    ]
+
+
+def build_credits(rows: list[dict], construct: bool) -> UserCreditsResponse:
+    def item(row: dict) -> BaseModel:
+        model = CreditClosedInfo if row["is_closed"] else CreditOpenInfo
+        return model.model_construct(**row) if construct else model(**row)
+
+    items = [item(row) for row in rows]
+    return UserCreditsResponse.model_construct(credits=items) if construct else UserCreditsResponse(credits=items)
+
+
+def build_months(rows: list[dict], construct: bool) -> YearPerformanceResponse:
+    if construct:
+        items = [YearPerformanceItem.model_construct(**row) for row in rows]
+        return YearPerformanceResponse.model_construct(items=items)
+    return YearPerformanceResponse(items=[YearPerformanceItem(**row) for row in rows])
+
+
+def default_body(model: BaseModel) -> bytes:
+    field = create_response_field(name="Response_bench", type_=type(model), mode="serialization")
+    content = asyncio.run(serialize_response(field=field, response_content=model))
+    return JSONResponse(content).body
+
+
+def fast_body(model: BaseModel) -> bytes:
+    return ModelJSONResponse(model).body
+
+
+def best(repeat: int, fn: Callable[[], object]) -> tuple[float, object]:
+    timings, result = [], None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+
+def bench(name: str, rows: list[dict], build: Callable[[list[dict], bool], BaseModel], repeat: int) -> bool:
+    print(f"{name}: {len(rows)} rows, best of {repeat}")
+    bodies = {}
+    baseline = None
+    paths = (("default", False, default_body), ("direct", False, fast_body), ("construct", True, fast_body))
+    for path, construct, render in paths:
+        build_time, model = best(repeat, lambda: build(rows, construct))
+        render_time, body = best(repeat, lambda: render(model))
+        total = build_time + render_time
+        bodies[path] = body
+        baseline = baseline or total
+        print(
+            f"  {path:<9} build {build_time * 1000:8.1f} ms  serialize {render_time * 1000:8.1f} ms  "
+            f"total {total * 1000:8.1f} ms  {len(rows) / total:>10.0f} rows/s  x{baseline / total:.1f}  "
+            f"{len(body) / 2**20:.1f} MiB"
+        )
+
+    ok = True
+    for path in ("direct", "construct"):
+        if bodies[path] == bodies["default"]:
+            continue
+        same = json.loads(bodies[path]) == json.loads(bodies["default"])
+        verdict = "equal" if same else "different"
+        print(f"  [{'ok' if same else 'FAIL'}] {path}: body differs byte-wise, {verdict} as JSON")
+        ok &= same
+    return ok
+
+
+def compressed_size(body: bytes, make_encoder: Callable) -> int:
+    encoder = make_encoder()
+    return len(encoder.compress(body) + encoder.finish())
+
+
+def bench_formats(model: BaseModel, repeat: int) -> None:
+    settings = get_settings()
+    codings = {"gzip": lambda: gzip_encoder(settings.compression_gzip_level)}
+    if brotli is not None:
+        codings["br"] = lambda: brotli_encoder(settings.compression_brotli_quality)
+    formats = {"json": ModelJSONResponse, "columnar": ColumnarJSONResponse}
+    if msgpack is not None:
+        formats["msgpack"] = MsgPackResponse
+
+    print(f"wire formats, {len(model.items)} year-performance items, best of {repeat}")
+    for name, response_class in formats.items():
+        encode_time, body = best(repeat, lambda: response_class(model).body)
+        sizes = []
+        for coding, make_encoder in codings.items():
+            compress_time, size = best(repeat, lambda: compressed_size(body, make_encoder))
+            sizes.append(f"{coding} {size / 2**20:6.2f} MiB in {compress_time * 1000:7.1f} ms")
+        print(f"  {name:<9} encode {encode_time * 1000:8.1f} ms  {len(body) / 2**20:6.2f} MiB  " + "  ".join(sizes))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    ok = bench("user_credits", credit_rows(args.rows, rng), build_credits, args.repeat)
+    months = month_rows(args.rows, rng)
+    ok &= bench("year_performance items", months, build_months, args.repeat)
+    bench_formats(build_months(months, construct=False), args.repeat)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Latency benchmark for PlansYearService.year_performance against the configured database.
+
+Usage:
+    python -m scripts.bench_year_performance --year 2025 --iterations 200 --concurrency 8
+
+Prints p50/p99 latency and SQL statements per call. To compare revisions, run it on a
+database with a production-sized payments table (see scripts.seed_from_csv) at each
+revision and diff the output.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from sqlalchemy import event
+
+from src.core.database import SessionLocal, engine
+from src.services.plans_year import PlansYearService
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def run(year: int, iterations: int, concurrency: int, warmup: int) -> None:
+    statements = 0
+
+    def count(*_):
+        nonlocal statements
+        statements += 1
+
+    async def call() -> float:
+        started = time.perf_counter()
+        async with SessionLocal() as session:
+            await PlansYearService(session).year_performance(year)
+        return time.perf_counter() - started
+
+    for _ in range(warmup):
+        await call()
+
+    slots = asyncio.Semaphore(concurrency)
+
+    async def timed() -> float:
+        async with slots:
+            return await call()
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count)
+    started = time.perf_counter()
+    try:
+        samples = await asyncio.gather(*(timed() for _ in range(iterations)))
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", count)
+    wall = time.perf_counter() - started
+    await engine.dispose()
+
+    print(f"year_performance({year}): {iterations} calls, concurrency {concurrency}")
+    print(f"  p50     {percentile(samples, 50) * 1000:8.2f} ms")
+    print(f"  p99     {percentile(samples, 99) * 1000:8.2f} ms")
+    print(f"  mean    {statistics.mean(samples) * 1000:8.2f} ms")
+    print(f"  rps     {iterations / wall:8.1f}")
+    print(f"  SQL/call {statements / iterations:7.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--year", type=int, required=True)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--warmup", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(run(args.year, args.iterations, args.concurrency, args.warmup))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Call every endpoint that declares a query_budget and fail if it executes more SQL
+statements than declared.
+
+Usage (against a seeded database, DATABASE_URL from env/.env):
+    python -m scripts.check_query_budgets
+
+The report cache is disabled so report endpoints reach the database. An endpoint
+with a budget but no sample request below also fails: add one when you add a budget.
+"""
+
+import argparse
+import asyncio
+import sys
+from datetime import date
+
+import httpx
+from fastapi.routing import APIRoute
+from sqlalchemy import func, select
+
+from src.core.cache import report_cache
+from src.core.config import get_settings
+from src.core.database import SessionLocal, engine
+from src.core.instrumentation import QueryBudgetExceeded, assert_query_budget, endpoint_budget, track_queries
+from src.main import app
+from src.services.categories import category_registry
+from src.models import Credit, PlanImportJob
+
+
+async def sample_requests() -> dict[tuple[str, str], dict]:
+    """(method, route path) -> httpx request arguments, with parameters taken from the data."""
+    async with SessionLocal() as session:
+        user_id = await session.scalar(select(Credit.user_id).limit(1)) or 1
+        user_ids = list(await session.scalars(select(Credit.user_id).distinct().limit(100))) or [user_id]
+        last_issuance = await session.scalar(select(func.max(Credit.issuance_date))) or date.today()
+        job_id = await session.scalar(select(PlanImportJob.id).limit(1)) or "00000000-0000-0000-0000-000000000000"
+
+    prefix = get_settings().api_v1_prefix
+    return {
+        ("GET", f"{prefix}/user_credits/{{user_id}}"): {"url": f"{prefix}/user_credits/{user_id}"},
+        ("POST", f"{prefix}/user_credits/batch"): {"url": f"{prefix}/user_credits/batch", "json": {"user_ids": user_ids}},
+        ("GET", f"{prefix}/plans/import_jobs/{{job_id}}"): {"url": f"{prefix}/plans/import_jobs/{job_id}"},
+        ("GET", f"{prefix}/plans/performance"): {
+            "url": f"{prefix}/plans/performance",
+            "params": {"report_date": last_issuance.isoformat()},
+        },
+        ("GET", f"{prefix}/plans/year_performance"): {
+            "url": f"{prefix}/plans/year_performance",
+            "params": {"year": last_issuance.year},
+        },
+        ("GET", f"{prefix}/plans/performance_series"): {
+            "url": f"{prefix}/plans/performance_series",
+            "params": {"from": f"{last_issuance.year}-01", "to": f"{last_issuance.year}-12"},
+        },
+        ("GET", f"{prefix}/portfolio/aging"): {
+            "url": f"{prefix}/portfolio/aging",
+            "params": {"as_of": last_issuance.isoformat(), "group_by": "issuance_month"},
+        },
+    }
+
+
+async def check() -> int:
+    report_cache.maxsize = 0
+    # the app lifespan loads it in production; without it the first report request would count the load
+    await category_registry.refresh()
+    samples = await sample_requests()
+    failures = 0
+
+    headers = {"X-API-Key": get_settings().api_key}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://check", headers=headers) as client:
+        for route in app.routes:
+            budget = endpoint_budget(getattr(route, "endpoint", None))
+            if not isinstance(route, APIRoute) or budget is None:
+                continue
+            for method in sorted(route.methods):
+                label = f"{method} {route.path}"
+                request = samples.get((method, route.path))
+                if request is None:
+                    print(f"[FAIL] {label}: budget declared but no sample request in scripts.check_query_budgets")
+                    failures += 1
+                    continue
+
+                with track_queries() as stats:
+                    response = await client.request(method, **request)
+                try:
+                    assert_query_budget(stats, budget, label)
+                except QueryBudgetExceeded as exc:
+                    print(f"[FAIL] {exc}")
+                    failures += 1
+                else:
+                    print(
+                        f"[ok] {label}: {stats.statements}/{budget.statements} statements, "
+                        f"{stats.rows} rows, {stats.db_time * 1000:.1f} ms in DB (HTTP {response.status_code})"
+                    )
+
+    await engine.dispose()
+    return failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.parse_args()
+    failures = asyncio.run(check())
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Run EXPLAIN on the SELECTs behind the API read paths and fail on full table scans.
+
+Usage (against a seeded database, DATABASE_URL from env/.env):
+    python -m scripts.check_query_plans
+"""
+
+import argparse
+import asyncio
+import sys
+from datetime import date, timedelta
+
+from sqlalchemy import event, func, select
+
+from src.core.database import SessionLocal, engine
+from src.models import Credit, Plan
+from src.services.categories import category_registry
+from src.services.credits import CreditsService
+from src.services.exports import ExportService
+from src.services.plans_import import PlansImportService
+from src.services.plans_monthly import PlansMonthlyService
+from src.services.plans_series import PlansSeriesService
+from src.services.plans_year import PlansYearService
+from src.services.portfolio import PortfolioService
+
+# Lookup tables small enough that a scan is the right plan.
+SMALL_TABLES = {"dictionary"}
+
+
+async def capture_statements() -> list[tuple[str, str, object]]:
+    """Call each endpoint read path of the services once and record (label, statement, parameters)."""
+    captured: list[tuple[str, str, object]] = []
+    label = ""
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((label, statement, parameters))
+
+    async with SessionLocal() as session:
+        user_ids = list(await session.scalars(select(Credit.user_id).distinct().limit(20))) or [1]
+        user_id = user_ids[0]
+        last_issuance = await session.scalar(select(func.max(Credit.issuance_date))) or date.today()
+        plans = (await session.execute(select(Plan.period, Plan.category_id).limit(10))).all()
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        async with SessionLocal() as session:
+            label = "CreditsService.get_user_credits"
+            await CreditsService(session).get_user_credits(user_id)
+            label = "CreditsService.get_user_credits(keyset)"
+            first_page = await CreditsService(session).get_user_credits(user_id, limit=1)
+            await CreditsService(session).get_user_credits(user_id, limit=10, after_id=first_page.next_after_id or 0)
+            label = "CreditsService.get_users_credits"
+            await CreditsService(session).get_users_credits(user_ids)
+            label = "PlansMonthlyService.plans_performance"
+            await PlansMonthlyService(session).plans_performance(last_issuance)
+            label = "PlansYearService.year_performance"
+            await PlansYearService(session).year_performance(last_issuance.year)
+            label = "PlansSeriesService.performance_series"
+            await PlansSeriesService(session).performance_series(
+                date(last_issuance.year - 1, 1, 1), last_issuance.replace(day=1), "range"
+            )
+            label = "PortfolioService.aging"
+            await PortfolioService(session).aging(date.today())
+            label = "PortfolioService.aging(historical)"
+            await PortfolioService(session).aging(last_issuance, "issuance_month")
+            label = "PlansImportService.existing_keys"
+            await PlansImportService(session).existing_keys(
+                [{"period": period, "category_id": category_id} for period, category_id in plans]
+                or [{"period": last_issuance.replace(day=1), "category_id": 1}]
+            )
+        # server-side cursors: a session of their own each, read to the end
+        async with SessionLocal() as session:
+            label = "CreditsService.iter_user_credits"
+            async for _ in CreditsService(session).iter_user_credits(user_id, limit=10):
+                pass
+        month_before = last_issuance - timedelta(days=31)
+        async with SessionLocal() as session:
+            label = "ExportService.credit_batches"
+            async for _ in ExportService(session).credit_batches(month_before, last_issuance):
+                pass
+        async with SessionLocal() as session:
+            label = "ExportService.payment_batches"
+            body_type_id = (await category_registry.current(session)).id_for("body")
+            async for _ in ExportService(session).payment_batches(month_before, last_issuance, body_type_id):
+                pass
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+    return captured
+
+
+async def check(allowed_tables: set[str]) -> int:
+    failures = 0
+    statements = await capture_statements()
+
+    async with engine.connect() as conn:
+        for label, statement, parameters in statements:
+            result = await conn.exec_driver_sql(f"EXPLAIN {statement}", parameters)
+            plan = [dict(row._mapping) for row in result]
+            scans = [
+                row
+                for row in plan
+                if row["type"] == "ALL" and row["table"] and not row["table"].startswith("<")
+                and row["table"] not in allowed_tables
+            ]
+            status = "FAIL" if scans else "ok"
+            print(f"[{status}] {label}: {' '.join(statement.split())[:120]}")
+            for row in plan:
+                print(f"    {row['table']}: type={row['type']} key={row['key']} rows={row['rows']} {row['Extra'] or ''}")
+            failures += bool(scans)
+
+    await engine.dispose()
+    print(f"{len(statements)} statements checked, {failures} with full table scans")
+    return failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--allow", action="append", default=[], help="extra table allowed to be scanned")
+    args = parser.parse_args()
+    failures = asyncio.run(check(SMALL_TABLES | set(args.allow)))
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
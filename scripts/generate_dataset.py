@@ -0,0 +1,100 @@
+"""
+Generate a scaled copy of the sample data in the same format as data/*.csv
+(tab-delimited, dd.mm.yyyy dates), ready for scripts.seed_from_csv --data-dir.
+
+Usage:
+    python -m scripts.generate_dataset --scale 100 --out /tmp/credits-x100 [--seed 1]
+
+Distributions are kept by resampling the shipped rows rather than fitting them:
+every generated credit is a copy of a random sample credit (dates, body, percent,
+return state) assigned to a random generated user, and gets a copy of that sample
+credit's payments. Users take registration dates from the sample, plans keep their
+periods and categories with sums multiplied by the scale, so plan completion stays
+comparable to the sample.
+"""
+
+import argparse
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from scripts.seed_from_csv import DATA_DIR
+
+CREDITS_PER_CHUNK = 200_000
+
+
+def read_sample(data_dir: Path, filename: str) -> pd.DataFrame:
+    return pd.read_csv(data_dir / filename, sep="\t", dtype=str, keep_default_na=False)
+
+
+def write(df: pd.DataFrame, path: Path, first: bool) -> None:
+    df.to_csv(path, sep="\t", index=False, header=first, mode="w" if first else "a")
+
+
+def generate(data_dir: Path, out: Path, scale: float, seed: int) -> dict[str, int]:
+    rng = np.random.default_rng(seed)
+    out.mkdir(parents=True, exist_ok=True)
+
+    users = read_sample(data_dir, "users.csv")
+    credits = read_sample(data_dir, "credits.csv")
+    payments = read_sample(data_dir, "payments.csv")
+    plans = read_sample(data_dir, "plans.csv")
+    shutil.copyfile(data_dir / "dictionary.csv", out / "dictionary.csv")
+
+    user_count = max(1, round(len(users) * scale))
+    user_ids = np.arange(1, user_count + 1)
+    write(
+        pd.DataFrame(
+            {
+                "id": user_ids,
+                "login": [f"user{user_id}" for user_id in user_ids],
+                "registration_date": rng.choice(users["registration_date"].to_numpy(), user_count),
+            }
+        ),
+        out / "users.csv",
+        first=True,
+    )
+
+    credits = credits.assign(source_id=credits["id"].astype("int64")).drop(columns=["id", "user_id"])
+    payments = payments.assign(source_id=payments["credit_id"].astype("int64")).drop(columns=["id", "credit_id"])
+    payment_columns = ["id", "credit_id", "payment_date", "type_id", "sum"]
+    credit_columns = ["id", "user_id", "issuance_date", "return_date", "actual_return_date", "body", "percent"]
+
+    credit_count = max(1, round(len(credits) * scale))
+    next_payment_id = 1
+    payment_count = 0
+    for start in range(0, credit_count, CREDITS_PER_CHUNK):
+        size = min(CREDITS_PER_CHUNK, credit_count - start)
+        chunk = credits.iloc[rng.integers(0, len(credits), size)].reset_index(drop=True)
+        chunk["id"] = np.arange(start + 1, start + size + 1)
+        chunk["user_id"] = rng.choice(user_ids, size)
+        write(chunk[credit_columns], out / "credits.csv", first=start == 0)
+
+        chunk_payments = chunk[["id", "source_id"]].rename(columns={"id": "credit_id"}).merge(payments, on="source_id")
+        chunk_payments["id"] = np.arange(next_payment_id, next_payment_id + len(chunk_payments))
+        write(chunk_payments[payment_columns], out / "payments.csv", first=start == 0)
+        next_payment_id += len(chunk_payments)
+        payment_count += len(chunk_payments)
+
+    plans["sum"] = (pd.to_numeric(plans["sum"]) * scale).round(2)
+    write(plans, out / "plans.csv", first=True)
+
+    return {"users": user_count, "credits": credit_count, "payments": payment_count, "plans": len(plans)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=float, required=True, help="multiple of the sample row counts")
+    parser.add_argument("--out", type=Path, required=True, help="output directory")
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR, help="sample CSVs to resample")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    counts = generate(args.data_dir, args.out, args.scale, args.seed)
+    for table, rows in counts.items():
+        print(f"{table:<10} {rows:>12}")
+
+
+if __name__ == "__main__":
+    main()
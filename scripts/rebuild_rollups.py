@@ -0,0 +1,33 @@
+"""
+Rebuild daily_issuance_totals / daily_payment_totals from credits and payments.
+
+Usage:
+    python -m scripts.rebuild_rollups                      # whole history
+    python -m scripts.rebuild_rollups --from 2024-01-01 --to 2024-12-31
+"""
+
+import argparse
+import asyncio
+from datetime import date
+
+from src.core.database import SessionLocal, engine
+from src.services.rollups import RollupsService
+
+
+async def rebuild(start: date | None, end: date | None) -> None:
+    async with SessionLocal() as session:
+        await RollupsService(session).rebuild(start, end)
+        await session.commit()
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--from", dest="start", type=date.fromisoformat, default=None, help="first day, YYYY-MM-DD")
+    parser.add_argument("--to", dest="end", type=date.fromisoformat, default=None, help="last day, YYYY-MM-DD")
+    args = parser.parse_args()
+    asyncio.run(rebuild(args.start, args.end))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Check credits.body_paid / percent_paid / last_payment_date against payments.
+
+Usage:
+    python -m scripts.reconcile_credit_balances            # report mismatches, exit 1 if any
+    python -m scripts.reconcile_credit_balances --fix      # correct the mismatched credits
+    python -m scripts.reconcile_credit_balances --rebuild  # recompute every credit (backfill)
+"""
+
+import argparse
+import asyncio
+import sys
+
+from src.core.database import SessionLocal, engine
+from src.services.balances import CreditBalancesService
+
+
+async def reconcile(fix: bool, rebuild: bool) -> int:
+    async with SessionLocal() as session:
+        service = CreditBalancesService(session)
+        if rebuild:
+            await service.rebuild()
+            await session.commit()
+            print("Credit balances rebuilt from payments")
+            mismatches = []
+        else:
+            mismatches = await service.reconcile(fix=fix)
+            await session.commit()
+    await engine.dispose()
+
+    for row in mismatches[:50]:
+        print(
+            f"credit {row['id']}: body_paid {row['body_paid']} != {row['expected_body_paid']}, "
+            f"percent_paid {row['percent_paid']} != {row['expected_percent_paid']}, "
+            f"last_payment_date {row['last_payment_date']} != {row['expected_last_payment_date']}"
+        )
+    if mismatches:
+        print(f"{len(mismatches)} credits mismatched" + (", fixed" if fix else ""))
+    return 0 if fix or not mismatches else 1
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fix", action="store_true", help="correct mismatched credits")
+    parser.add_argument("--rebuild", action="store_true", help="recompute balances of every credit")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(reconcile(args.fix, args.rebuild)))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,102 +1,129 @@
+"""
+Recreate the schema and load the tab-delimited CSVs (dd.mm.yyyy dates) from data/.
+
+Usage:
+    python -m scripts.seed_from_csv [--data-dir data] [--chunk-size 50000] [--resume]
+
+Files are streamed in chunks, dates are parsed per column, and every chunk is one
+executemany INSERT in its own transaction. Tables that don't depend on each other
+load concurrently: dictionary and users, then credits, then payments and plans.
+--resume keeps the existing tables and skips rows whose id is not above the table's
+current max(id), so an interrupted load of id-ordered files can be continued.
+Rollups and credit balances are rebuilt once everything is loaded.
+"""
+
+import argparse
 import asyncio
-import csv
-from datetime import datetime
-from decimal import Decimal
+import time
 from pathlib import Path
+from typing import NamedTuple
 
-from sqlalchemy.ext.asyncio import AsyncSession
+import pandas as pd
+from sqlalchemy import func, insert, select
 
 from src.core.database import Base, SessionLocal, engine
 from src.models import Credit, Dictionary, Payment, Plan, User
+from src.services.categories import DEFAULT_CATEGORY_KINDS
+from src.services.balances import CreditBalancesService
+from src.services.rollups import RollupsService
 
 DATA_DIR = Path(__file__).resolve().parent.parent / "data"
-
-
-def load_csv(filename: str):
-    """Load tab-delimited CSV with dot-separated dates (dd.mm.yyyy)."""
-    path = DATA_DIR / filename
-    with path.open() as f:
-        reader = csv.DictReader(f, delimiter="\t")
-        return list(reader)
-
-
-async def seed():
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.drop_all)
-        await conn.run_sync(Base.metadata.create_all)
-
-    users_data = load_csv("users.csv")
-    credits_data = load_csv("credits.csv")
-    payments_data = load_csv("payments.csv")
-    plans_data = load_csv("plans.csv")
-    dictionary_data = load_csv("dictionary.csv")
+DATE_FORMAT = "%d.%m.%Y"
+
+
+class TableSource(NamedTuple):
+    model: type
+    filename: str
+    dates: tuple[str, ...] = ()
+
+
+SOURCES = {
+    "dictionary": TableSource(Dictionary, "dictionary.csv"),
+    "users": TableSource(User, "users.csv", ("registration_date",)),
+    "credits": TableSource(Credit, "credits.csv", ("issuance_date", "return_date", "actual_return_date")),
+    "payments": TableSource(Payment, "payments.csv", ("payment_date",)),
+    "plans": TableSource(Plan, "plans.csv", ("period",)),
+}
+
+# each stage only references tables loaded by earlier stages
+STAGES = (("dictionary", "users"), ("credits",), ("payments", "plans"))
+
+
+def read_chunks(path: Path, chunk_size: int):
+    """Stream the file as string columns; amounts stay decimal strings and are converted by MySQL exactly."""
+    return pd.read_csv(path, sep="\t", dtype=str, keep_default_na=False, chunksize=chunk_size)
+
+
+def chunk_records(chunk: pd.DataFrame, source: TableSource, after_id: int) -> list[dict]:
+    chunk = chunk.assign(id=chunk["id"].astype("int64"))
+    chunk = chunk[chunk["id"] > after_id].copy()
+    for column in chunk.columns:
+        if column in source.dates:
+            parsed = pd.to_datetime(chunk[column].replace("", None), format=DATE_FORMAT)
+            chunk[column] = parsed.dt.date.astype(object).where(parsed.notna(), None)
+        elif column == "id" or column.endswith("_id"):
+            chunk[column] = chunk[column].astype("int64").astype(object)
+    if source.model is Dictionary:
+        chunk["category_kind"] = [DEFAULT_CATEGORY_KINDS.get(name.lower()) for name in chunk["name"]]
+    return chunk.to_dict("records")
+
+
+async def load_table(name: str, data_dir: Path, chunk_size: int, resume: bool) -> tuple[int, float]:
+    source = SOURCES[name]
+    table = source.model.__table__
+    started = time.perf_counter()
+    after_id = 0
+    if resume:
+        async with engine.connect() as conn:
+            after_id = await conn.scalar(select(func.max(table.c.id))) or 0
+
+    loaded = 0
+    chunks = iter(read_chunks(data_dir / source.filename, chunk_size))
+    # parse the next chunk in a thread while other tables' inserts are in flight
+    while (chunk := await asyncio.to_thread(next, chunks, None)) is not None:
+        records = chunk_records(chunk, source, after_id)
+        if not records:
+            continue
+        async with engine.begin() as conn:
+            await conn.execute(insert(table), records)
+        loaded += len(records)
+
+    elapsed = time.perf_counter() - started
+    skipped = f", resumed after id {after_id}" if after_id else ""
+    print(f"{name:<10} {loaded:>10} rows {elapsed:8.2f} s {loaded / elapsed if elapsed else 0:>10.0f} rows/s{skipped}")
+    return loaded, elapsed
+
+
+async def seed(data_dir: Path = DATA_DIR, chunk_size: int = 50_000, resume: bool = False):
+    if not resume:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(Base.metadata.create_all)
+
+    started = time.perf_counter()
+    loaded = 0
+    for stage in STAGES:
+        results = await asyncio.gather(*(load_table(name, data_dir, chunk_size, resume) for name in stage))
+        loaded += sum(rows for rows, _ in results)
 
     async with SessionLocal() as session:
-        await seed_dictionary(session, dictionary_data)
-        await seed_users(session, users_data)
-        await seed_credits(session, credits_data)
-        await seed_payments(session, payments_data)
-        await seed_plans(session, plans_data)
+        await RollupsService(session).rebuild()
+        await CreditBalancesService(session).rebuild()
         await session.commit()
+    await engine.dispose()
+
+    elapsed = time.perf_counter() - started
+    print(f"{'total':<10} {loaded:>10} rows {elapsed:8.2f} s {loaded / elapsed:>10.0f} rows/s (including rebuilds)")
 
 
-async def seed_dictionary(session: AsyncSession, rows):
-    for row in rows:
-        session.add(Dictionary(id=int(row["id"]), name=row["name"]))
-
-
-async def seed_users(session: AsyncSession, rows):
-    for row in rows:
-        session.add(
-            User(
-                id=int(row["id"]),
-                login=row["login"],
-                registration_date=datetime.strptime(row["registration_date"], "%d.%m.%Y").date(),
-            )
-        )
-
-
-async def seed_credits(session: AsyncSession, rows):
-    for row in rows:
-        session.add(
-            Credit(
-                id=int(row["id"]),
-                user_id=int(row["user_id"]),
-                issuance_date=datetime.strptime(row["issuance_date"], "%d.%m.%Y").date(),
-                return_date=datetime.strptime(row["return_date"], "%d.%m.%Y").date(),
-                actual_return_date=datetime.strptime(row["actual_return_date"], "%d.%m.%Y").date()
-                if row["actual_return_date"]
-                else None,
-                body=Decimal(row["body"]),
-                percent=Decimal(row["percent"]),
-            )
-        )
-
-
-async def seed_payments(session: AsyncSession, rows):
-    for row in rows:
-        session.add(
-            Payment(
-                id=int(row["id"]),
-                sum=Decimal(row["sum"]),
-                payment_date=datetime.strptime(row["payment_date"], "%d.%m.%Y").date(),
-                credit_id=int(row["credit_id"]),
-                type_id=int(row["type_id"]),
-            )
-        )
-
-
-async def seed_plans(session: AsyncSession, rows):
-    for row in rows:
-        session.add(
-            Plan(
-                id=int(row["id"]),
-                period=datetime.strptime(row["period"], "%d.%m.%Y").date(),
-                sum=Decimal(row["sum"]),
-                category_id=int(row["category_id"]),
-            )
-        )
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR)
+    parser.add_argument("--chunk-size", type=int, default=50_000, help="rows per INSERT / transaction")
+    parser.add_argument("--resume", action="store_true", help="keep existing rows and continue after max(id)")
+    args = parser.parse_args()
+    asyncio.run(seed(args.data_dir, args.chunk_size, args.resume))
 
 
 if __name__ == "__main__":
-    asyncio.run(seed())
+    main()
@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends
+
+from src.core.cache import report_cache
+from src.core.metrics import TimedRoute
+from src.core.security import api_key_auth
+from src.core.singleflight import report_flights
+from src.core.slow_queries import slow_query_log
+from src.schemas.responses import CacheStatsResponse, CoalescingStats, SlowQueryRecord
+
+router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(api_key_auth)], route_class=TimedRoute)
+
+
+@router.get("/report_cache", response_model=CacheStatsResponse)
+async def report_cache_stats() -> CacheStatsResponse:
+    return CacheStatsResponse(**report_cache.stats())
+
+
+@router.get("/report_coalescing", response_model=dict[str, CoalescingStats])
+async def report_coalescing_stats() -> dict[str, CoalescingStats]:
+    return {endpoint: CoalescingStats(**stats) for endpoint, stats in report_flights.stats().items()}
+
+
+@router.get("/slow_queries", response_model=list[SlowQueryRecord])
+async def slow_queries() -> list[SlowQueryRecord]:
+    return [SlowQueryRecord(**record) for record in slow_query_log.entries()]
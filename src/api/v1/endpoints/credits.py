@@ -1,15 +1,60 @@
-from fastapi import APIRouter, Depends
+from typing import AsyncIterator
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.config import get_settings
 from src.core.security import api_key_auth
-from src.core.database import get_session
-from src.schemas.responses import UserCreditsResponse
+from src.core.database import get_read_session, read_sessionmaker
+from src.core.instrumentation import query_budget
+from src.core.metrics import TimedRoute
+from src.core.responses import ModelJSONResponse
+from src.schemas.requests import UserCreditsBatchRequest
+from src.schemas.responses import UserCreditsBatchResponse, UserCreditsResponse
 from src.services.credits import CreditsService
 
-router = APIRouter(prefix="/user_credits", tags=["credits"], dependencies=[Depends(api_key_auth)])
+router = APIRouter(prefix="/user_credits", tags=["credits"], dependencies=[Depends(api_key_auth)], route_class=TimedRoute)
+
+NDJSON = "application/x-ndjson"
+
+
+@router.get(
+    "/{user_id}",
+    response_model=UserCreditsResponse,
+    responses={200: {"content": {NDJSON: {}}, "description": "JSON page, or one credit per line for Accept: " + NDJSON}},
+)
+@query_budget(statements=1)
+async def user_credits(
+    user_id: int,
+    limit: int | None = Query(None, ge=1, le=1000, description="Page size; enables keyset pagination"),
+    after_id: int | None = Query(None, ge=0, description="next_after_id of the previous page"),
+    accept: str | None = Header(None),
+    session: AsyncSession = Depends(get_read_session),
+) -> UserCreditsResponse:
+    if accept and NDJSON in accept:
+        return StreamingResponse(_stream_user_credits(user_id, after_id, limit), media_type=NDJSON)
+    service = CreditsService(session)
+    return ModelJSONResponse(await service.get_user_credits(user_id, limit=limit, after_id=after_id))
+
+
+async def _stream_user_credits(user_id: int, after_id: int | None, limit: int | None) -> AsyncIterator[bytes]:
+    # the request-scoped session is closed before the body is sent, so the stream owns its own
+    async with (await read_sessionmaker())() as session:
+        async for item in CreditsService(session).iter_user_credits(user_id, after_id=after_id, limit=limit):
+            yield item.__pydantic_serializer__.to_json(item) + b"\n"
 
 
-@router.get("/{user_id}", response_model=UserCreditsResponse)
-async def user_credits(user_id: int, session: AsyncSession = Depends(get_session)) -> UserCreditsResponse:
+@router.post("/batch", response_model=UserCreditsBatchResponse)
+@query_budget(statements=1)
+async def user_credits_batch(
+    payload: UserCreditsBatchRequest,
+    session: AsyncSession = Depends(get_read_session),
+) -> UserCreditsBatchResponse:
+    user_ids = list(dict.fromkeys(payload.user_ids))
+    max_users = get_settings().user_credits_batch_max
+    if len(user_ids) > max_users:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"At most {max_users} user_ids per request")
     service = CreditsService(session)
-    return await service.get_user_credits(user_id)
+    results = await service.get_users_credits(user_ids)
+    return ModelJSONResponse(UserCreditsBatchResponse(results=results))
@@ -0,0 +1,100 @@
+from datetime import date
+from typing import AsyncIterator, Callable
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api.v1.endpoints.plans import month_range
+from src.core.database import get_read_session, read_sessionmaker
+from src.core.metrics import TimedRoute
+from src.core.security import api_key_auth
+from src.services.categories import category_registry
+from src.services.exports import (
+    CREDIT_COLUMNS,
+    MEDIA_TYPES,
+    PAYMENT_COLUMNS,
+    YEAR_PERFORMANCE_COLUMNS,
+    ExportColumn,
+    ExportFormat,
+    ExportService,
+    Rows,
+    export_available,
+    render_export,
+    single_batch,
+)
+from src.services.plans import PlansService
+from src.services.plans_series import ShareScope
+
+router = APIRouter(prefix="/export", tags=["export"], dependencies=[Depends(api_key_auth)], route_class=TimedRoute)
+
+FORMAT_QUERY = Query(
+    "csv", alias="format", description="csv and parquet are streamed as rows are read, xlsx once complete"
+)
+EXPORT_RESPONSES = {200: {"content": {media_type: {} for media_type in MEDIA_TYPES.values()}}}
+
+
+def export_format_param(export_format: ExportFormat = FORMAT_QUERY) -> ExportFormat:
+    if not export_available(export_format):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Parquet export needs the pyarrow package")
+    return export_format
+
+
+def _export_response(export_format: ExportFormat, name: str, chunks: AsyncIterator[bytes]) -> StreamingResponse:
+    return StreamingResponse(
+        chunks,
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{export_format}"'},
+    )
+
+
+async def _register_chunks(
+    export_format: ExportFormat, columns: tuple[ExportColumn, ...], read: Callable[[ExportService], AsyncIterator[Rows]]
+) -> AsyncIterator[bytes]:
+    # the request-scoped session is closed before the body is sent, so the stream owns its own
+    async with (await read_sessionmaker())() as session:
+        async for chunk in render_export(export_format, columns, read(ExportService(session))):
+            yield chunk
+
+
+@router.get("/credits", response_class=StreamingResponse, responses=EXPORT_RESPONSES)
+async def export_credits(
+    date_from: date | None = Query(None, alias="from", description="First issuance date"),
+    date_to: date | None = Query(None, alias="to", description="Last issuance date"),
+    export_format: ExportFormat = Depends(export_format_param),
+) -> StreamingResponse:
+    chunks = _register_chunks(export_format, CREDIT_COLUMNS, lambda service: service.credit_batches(date_from, date_to))
+    return _export_response(export_format, "credits", chunks)
+
+
+@router.get("/payments", response_class=StreamingResponse, responses=EXPORT_RESPONSES)
+async def export_payments(
+    date_from: date | None = Query(None, alias="from", description="First payment date"),
+    date_to: date | None = Query(None, alias="to", description="Last payment date"),
+    category: str | None = Query(None, description="Payment category name, e.g. тіло or відсотки"),
+    export_format: ExportFormat = Depends(export_format_param),
+    session: AsyncSession = Depends(get_read_session),
+) -> StreamingResponse:
+    type_id = None
+    if category is not None:
+        type_id = (await category_registry.current(session)).id_for_name(category)
+        if type_id is None:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unknown category '{category}'")
+    chunks = _register_chunks(
+        export_format, PAYMENT_COLUMNS, lambda service: service.payment_batches(date_from, date_to, type_id)
+    )
+    return _export_response(export_format, "payments", chunks)
+
+
+@router.get("/year_performance", response_class=StreamingResponse, responses=EXPORT_RESPONSES)
+async def export_year_performance(
+    months: tuple[date, date] = Depends(month_range),
+    share_scope: ShareScope = Query("year", description="Month shares relative to each year or to the whole range"),
+    export_format: ExportFormat = Depends(export_format_param),
+    session: AsyncSession = Depends(get_read_session),
+) -> StreamingResponse:
+    """Plan vs fact per month, the months of /plans/performance_series as a table."""
+    series = await PlansService(session).performance_series(*months, share_scope)
+    rows = [tuple(getattr(item, column.name) for column in YEAR_PERFORMANCE_COLUMNS) for item in series.months]
+    chunks = render_export(export_format, YEAR_PERFORMANCE_COLUMNS, single_batch(rows))
+    return _export_response(export_format, "year_performance", chunks)
@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Depends, Header, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.database import get_session
+from src.core.metrics import TimedRoute
+from src.core.security import api_key_auth
+from src.schemas.responses import BulkIngestResponse
+from src.services.ingest import NDJSON, IngestService, read_ingest_body
+
+router = APIRouter(tags=["ingest"], dependencies=[Depends(api_key_auth)], route_class=TimedRoute)
+
+BULK_BODY = {
+    "requestBody": {
+        "content": {
+            "application/json": {"schema": {"type": "array", "items": {"type": "object"}}},
+            NDJSON: {"schema": {"type": "string"}},
+        },
+        "required": True,
+    }
+}
+
+
+@router.post("/credits/bulk", response_model=BulkIngestResponse, openapi_extra=BULK_BODY)
+async def credits_bulk(
+    request: Request,
+    idempotency_key: str | None = Header(None, max_length=100),
+    session: AsyncSession = Depends(get_session),
+) -> BulkIngestResponse:
+    body = await read_ingest_body(request)
+    service = IngestService(session)
+    return await service.ingest("credits", body, request.headers.get("content-type"), idempotency_key)
+
+
+@router.post("/payments/bulk", response_model=BulkIngestResponse, openapi_extra=BULK_BODY)
+async def payments_bulk(
+    request: Request,
+    idempotency_key: str | None = Header(None, max_length=100),
+    session: AsyncSession = Depends(get_session),
+) -> BulkIngestResponse:
+    body = await read_ingest_body(request)
+    service = IngestService(session)
+    return await service.ingest("payments", body, request.headers.get("content-type"), idempotency_key)
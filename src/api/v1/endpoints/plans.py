@@ -1,38 +1,113 @@
 from datetime import date
 
-from fastapi import APIRouter, Depends, File, Query, UploadFile
+from fastapi import APIRouter, BackgroundTasks, Depends, File, Header, HTTPException, Query, UploadFile, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.security import api_key_auth
-from src.core.database import get_session
-from src.schemas.responses import PlanInsertResponse, PlansPerformanceResponse, YearPerformanceResponse
+from src.core.database import get_read_session, get_session
+from src.core.instrumentation import query_budget
+from src.core.metrics import TimedRoute
+from src.core.responses import REPORT_RESPONSES, ModelJSONResponse, report_response
+from src.schemas.responses import (
+    PerformanceSeriesResponse,
+    PlanImportJobResponse,
+    PlanInsertResponse,
+    PlansPerformanceResponse,
+    YearPerformanceResponse,
+)
 from src.services.plans import PlansService
+from src.services.plans_import import ImportMode
+from src.services.plans_jobs import PlansImportJobService, job_response, run_import_job
+from src.services.plans_series import ShareScope
 
-router = APIRouter(prefix="/plans", tags=["plans"], dependencies=[Depends(api_key_auth)])
+MAX_SERIES_MONTHS = 120
+
+router = APIRouter(prefix="/plans", tags=["plans"], dependencies=[Depends(api_key_auth)], route_class=TimedRoute)
 
 
 @router.post("/insert", response_model=PlanInsertResponse)
 async def plans_insert(
     file: UploadFile = File(...),
+    mode: ImportMode = Query("insert", description="insert rejects existing plans, upsert overwrites their sums"),
     session: AsyncSession = Depends(get_session),
 ) -> PlanInsertResponse:
     service = PlansService(session)
-    return await service.insert_plans(file)
+    return await service.insert_plans(file, mode)
+
+
+@router.post("/import_jobs", response_model=PlanImportJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def plans_import_job_create(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    mode: ImportMode = Query("insert", description="insert skips existing plans, upsert overwrites their sums"),
+    session: AsyncSession = Depends(get_session),
+) -> PlanImportJobResponse:
+    service = PlansImportJobService(session)
+    job, path = await service.create_job(file, mode)
+    background_tasks.add_task(run_import_job, job.id, path, mode)
+    return job_response(job)
 
 
-@router.get("/performance", response_model=PlansPerformanceResponse)
+@router.get("/import_jobs/{job_id}", response_model=PlanImportJobResponse)
+@query_budget(statements=1)
+async def plans_import_job_status(job_id: str, session: AsyncSession = Depends(get_session)) -> PlanImportJobResponse:
+    service = PlansImportJobService(session)
+    return await service.get_job(job_id)
+
+
+@router.get("/performance", response_model=PlansPerformanceResponse, responses=REPORT_RESPONSES)
+@query_budget(statements=3)
 async def plans_performance(
     report_date: date = Query(..., description="Date for performance calculation"),
-    session: AsyncSession = Depends(get_session),
+    accept: str | None = Header(None),
+    session: AsyncSession = Depends(get_read_session),
 ) -> PlansPerformanceResponse:
     service = PlansService(session)
-    return await service.plans_performance(report_date)
+    return report_response(await service.plans_performance(report_date), accept)
 
 
-@router.get("/year_performance", response_model=YearPerformanceResponse)
+@router.get("/year_performance", response_model=YearPerformanceResponse, responses=REPORT_RESPONSES)
+@query_budget(statements=1)
 async def year_performance(
     year: int = Query(..., ge=1900, le=2100),
-    session: AsyncSession = Depends(get_session),
+    accept: str | None = Header(None),
+    session: AsyncSession = Depends(get_read_session),
 ) -> YearPerformanceResponse:
     service = PlansService(session)
-    return await service.year_performance(year)
+    return report_response(await service.year_performance(year), accept)
+
+
+# YYYY-MM with the year in 1900-2100, the range /year_performance accepts
+MONTH_PATTERN = r"^(19\d{2}|20\d{2}|2100)-(0[1-9]|1[0-2])$"
+
+
+def _month_start(value: str) -> date:
+    year, month = value.split("-")
+    return date(int(year), int(month), 1)
+
+
+def month_range(
+    from_month: str = Query(..., alias="from", pattern=MONTH_PATTERN, description="First month, YYYY-MM"),
+    to_month: str = Query(..., alias="to", pattern=MONTH_PATTERN, description="Last month, YYYY-MM"),
+) -> tuple[date, date]:
+    """First days of the first and last month of a from/to range of at most MAX_SERIES_MONTHS months."""
+    start, end = _month_start(from_month), _month_start(to_month)
+    if start > end:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="'from' must not be after 'to'")
+    if (end.year - start.year) * 12 + end.month - start.month >= MAX_SERIES_MONTHS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=f"Range must not exceed {MAX_SERIES_MONTHS} months"
+        )
+    return start, end
+
+
+@router.get("/performance_series", response_model=PerformanceSeriesResponse)
+@query_budget(statements=2)
+async def performance_series(
+    months: tuple[date, date] = Depends(month_range),
+    share_scope: ShareScope = Query("year", description="Month shares relative to each year or to the whole range"),
+    session: AsyncSession = Depends(get_read_session),
+) -> PerformanceSeriesResponse:
+    start, end = months
+    service = PlansService(session)
+    return ModelJSONResponse(await service.performance_series(start, end, share_scope))
@@ -0,0 +1,27 @@
+from datetime import date
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.database import get_read_session
+from src.core.instrumentation import query_budget
+from src.core.metrics import TimedRoute
+from src.core.responses import ModelJSONResponse
+from src.core.security import api_key_auth
+from src.schemas.responses import PortfolioAgingResponse
+from src.services.portfolio import AgingGroupBy, PortfolioService
+
+router = APIRouter(
+    prefix="/portfolio", tags=["portfolio"], dependencies=[Depends(api_key_auth)], route_class=TimedRoute
+)
+
+
+@router.get("/aging", response_model=PortfolioAgingResponse)
+@query_budget(statements=1)
+async def portfolio_aging(
+    as_of: date | None = Query(None, description="Date to age the portfolio at; today by default"),
+    group_by: AgingGroupBy | None = Query(None, description="Also break the buckets down by issuance month"),
+    session: AsyncSession = Depends(get_read_session),
+) -> PortfolioAgingResponse:
+    service = PortfolioService(session)
+    return ModelJSONResponse(await service.aging(as_of or date.today(), group_by))
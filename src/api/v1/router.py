@@ -1,8 +1,12 @@
 from fastapi import APIRouter
 
-from src.api.v1.endpoints import credits, plans
+from src.api.v1.endpoints import admin, credits, exports, ingest, plans, portfolio
 
 router = APIRouter(prefix="/v1")
 
 router.include_router(credits.router)
 router.include_router(plans.router)
+router.include_router(portfolio.router)
+router.include_router(ingest.router)
+router.include_router(exports.router)
+router.include_router(admin.router)
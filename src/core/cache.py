@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Hashable
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.config import get_settings
+
+
+class TTLCache:
+    """
+    Bounded LRU cache with a per-entry TTL. Not shared between worker processes.
+    generation is bumped by every clear(): a result computed across a clear may predate
+    the write behind it, so callers compare the generation before and after computing.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.generation = 0
+        # monotonic time of the last clear(), None if never cleared
+        self.cleared_at: float | None = None
+
+    def get(self, key: Hashable) -> tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return False, None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return False, None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return True, value
+
+    def set(self, key: Hashable, value: Any, ttl: float) -> None:
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.generation += 1
+        self.cleared_at = time.monotonic()
+        self.invalidations += 1
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+
+def report_ttl(period_end: date) -> float:
+    """Periods that ended before the current month are closed and kept long; anything else briefly."""
+    settings = get_settings()
+    if period_end < date.today().replace(day=1):
+        return settings.report_cache_closed_ttl
+    return settings.report_cache_open_ttl
+
+
+def clear_on_commit(cache: TTLCache, session: AsyncSession) -> None:
+    """Clear the cache when the session's current transaction commits, not before its writes are visible."""
+    event.listen(session.sync_session, "after_commit", lambda _: cache.clear(), once=True)
+
+
+report_cache = TTLCache(get_settings().report_cache_size)
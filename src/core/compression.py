@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import zlib
+from typing import Callable
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # optional: pip install brotli
+    brotli = None
+
+# already compressed formats, not worth a second pass
+INCOMPRESSIBLE_TYPES = (
+    "image/",
+    "video/",
+    "audio/",
+    "application/zip",
+    "application/gzip",
+    "application/vnd.openxmlformats-officedocument.",
+    "application/vnd.apache.parquet",
+)
+
+
+class Encoder:
+    """
+    Incremental compressor: compress() returns what is ready so far, flush() whatever it
+    still buffers so the client can decode everything given so far, finish() the rest.
+    """
+
+    def __init__(
+        self, compress: Callable[[bytes], bytes], flush: Callable[[], bytes], finish: Callable[[], bytes]
+    ):
+        self.compress = compress
+        self.flush = flush
+        self.finish = finish
+
+
+def gzip_encoder(level: int) -> Encoder:
+    # wbits=31: gzip container, as with the gzip module
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    return Encoder(compressor.compress, lambda: compressor.flush(zlib.Z_SYNC_FLUSH), compressor.flush)
+
+
+def brotli_encoder(quality: int) -> Encoder:
+    compressor = brotli.Compressor(quality=quality)
+    return Encoder(compressor.process, compressor.flush, compressor.finish)
+
+
+def header_qualities(value: str) -> list[tuple[str, float]]:
+    """(value, q) pairs of an Accept-style header, lower-cased, in header order."""
+    pairs = []
+    for part in value.lower().split(","):
+        token, _, params = part.partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, number = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(number)
+                except ValueError:
+                    quality = 0.0
+        if token.strip():
+            pairs.append((token.strip(), quality))
+    return pairs
+
+
+def accepted_encodings(accept_encoding: str) -> set[str]:
+    """Codings the client accepts (q > 0)."""
+    return {coding for coding, quality in header_qualities(accept_encoding) if quality > 0}
+
+
+class CompressionMiddleware:
+    """
+    Compresses response bodies of at least minimum_size bytes with brotli (when the brotli
+    package is installed and the client accepts br) or gzip. Streamed bodies are always
+    compressed, chunk by chunk, since their size is not known up front; every chunk is
+    flushed so it reaches the client without waiting for the next. Responses that
+    already carry a Content-Encoding or have an incompressible media type pass through.
+    minimum_size 0 disables compression.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int, gzip_level: int, brotli_quality: int):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.minimum_size:
+            await self.app(scope, receive, send)
+            return
+
+        accepted = accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+        if brotli is not None and "br" in accepted:
+            coding, make_encoder = "br", lambda: brotli_encoder(self.brotli_quality)
+        elif "gzip" in accepted:
+            coding, make_encoder = "gzip", lambda: gzip_encoder(self.gzip_level)
+        else:
+            await self.app(scope, receive, send)
+            return
+
+        start: Message | None = None
+        encoder: Encoder | None = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, encoder, passthrough
+            if message["type"] == "http.response.start":
+                # held back until the first body chunk tells whether to compress
+                start = message
+                headers = Headers(raw=message["headers"])
+                media_type = headers.get("content-type", "")
+                passthrough = "content-encoding" in headers or media_type.startswith(INCOMPRESSIBLE_TYPES)
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                if start is not None:
+                    await send(start)
+                    start = None
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if start is not None:
+                headers = MutableHeaders(raw=start["headers"])
+                headers.add_vary_header("Accept-Encoding")
+                if not more_body and len(body) < self.minimum_size:
+                    passthrough = True
+                    await send(start)
+                    start = None
+                    await send(message)
+                    return
+                encoder = make_encoder()
+                headers["Content-Encoding"] = coding
+                if more_body:
+                    del headers["Content-Length"]
+
+            data = encoder.compress(body)
+            # each streamed chunk (an NDJSON line, an export batch) goes out as soon as it is produced
+            data += encoder.flush() if more_body else encoder.finish()
+            if start is not None:
+                if not more_body:
+                    MutableHeaders(raw=start["headers"])["Content-Length"] = str(len(data))
+                await send(start)
+                start = None
+            await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
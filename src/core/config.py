@@ -14,6 +14,71 @@ class Settings(BaseSettings):
         description="Async SQLAlchemy database URL",
     )
 
+    read_database_url: str | None = Field(default=None, description="Optional read replica for read-only endpoints")
+    read_fallback_to_primary: bool = Field(
+        default=True, description="Read from the primary while the replica is unreachable or lagging"
+    )
+    read_max_lag_seconds: float = Field(
+        default=30, description="Replica lag above which reads fall back to the primary (0: no lag check)"
+    )
+    read_check_interval: float = Field(default=5, description="Seconds a replica health verdict is reused")
+    read_check_timeout: float = Field(
+        default=2, description="Seconds a replica health check may take before the replica counts as down"
+    )
+
+    db_pool_size: int = Field(default=10, description="Connections kept open per worker process")
+    db_max_overflow: int = Field(default=10, description="Extra connections a worker may open under bursts")
+    db_pool_timeout: float = Field(default=10, description="Seconds a request waits for a free connection")
+    db_pool_recycle: int = Field(
+        default=1800, description="Seconds after which a connection is replaced; keep below MySQL wait_timeout"
+    )
+    db_pool_pre_ping: bool = Field(default=True, description="Check connections on checkout and replace dead ones")
+    db_pool_warmup: int = Field(default=4, description="Connections opened at startup, at most db_pool_size")
+
+    user_credits_batch_max: int = Field(default=500, description="Max user_ids per POST /user_credits/batch")
+
+    plans_upload_max_bytes: int = Field(default=20 * 1024 * 1024, description="Hard cap on a plans upload size")
+    plans_upload_max_rows: int = Field(default=200_000, description="Hard cap on data rows in a plans file")
+    plans_upload_chunk_size: int = Field(default=1024 * 1024, description="Chunk size used to spool uploads to disk")
+    plans_parse_workers: int = Field(default=2, description="Processes used to parse plan files off the event loop")
+    plans_import_max_concurrency: int = Field(
+        default=2, description="Background plan imports running at once per worker; keep below the pool size"
+    )
+    plans_import_heartbeat_interval: float = Field(
+        default=15, description="Seconds between heartbeats of a worker's queued and running import jobs"
+    )
+    plans_import_stale_after: float = Field(
+        default=120, description="Seconds without a heartbeat after which a queued or running import job is failed"
+    )
+
+    ingest_max_bytes: int = Field(default=50 * 1024 * 1024, description="Hard cap on a bulk ingestion request body")
+    ingest_max_rows: int = Field(default=100_000, description="Max rows per POST /credits/bulk or /payments/bulk")
+    ingest_batch_size: int = Field(default=1000, description="Rows per insert statement and transaction in bulk ingestion")
+
+    export_batch_size: int = Field(default=5000, description="Rows per server-side cursor round trip in /export")
+
+    category_registry_ttl: float = Field(default=300, description="Seconds between background dictionary reloads")
+
+    report_cache_size: int = Field(default=512, description="Max cached report results per worker")
+    report_cache_closed_ttl: float = Field(default=6 * 3600, description="Seconds to cache reports for closed periods")
+    report_cache_open_ttl: float = Field(default=30, description="Seconds to cache reports covering the current month")
+    report_cache_check_interval: float = Field(
+        default=2, description="Seconds between checks for writes committed by other workers"
+    )
+
+    slow_query_threshold: float = Field(
+        default=0.5, description="Seconds; slower statements are recorded with an EXPLAIN (0 disables)"
+    )
+    slow_query_log_size: int = Field(default=200, description="Slow queries kept per worker for /admin/slow_queries")
+
+    compression_min_size: int = Field(
+        default=1024, description="Bytes; smaller response bodies are sent uncompressed (0 disables compression)"
+    )
+    compression_gzip_level: int = Field(default=6, ge=1, le=9)
+    compression_brotli_quality: int = Field(
+        default=4, ge=0, le=11, description="Used when the brotli package is installed"
+    )
+
     debug: bool = Field(default=True)
     echo_sql: bool = Field(default=False)
 
@@ -1,21 +1,110 @@
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+import asyncio
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 
 from src.core.config import get_settings
+from src.core.instrumentation import TimedQueuePool
+from src.core.replica import ReplicaMonitor
+
+logger = logging.getLogger(__name__)
 
 
 class Base(DeclarativeBase):
     pass
 
 
+def _create_engine(url: str) -> AsyncEngine:
+    return create_async_engine(
+        url,
+        echo=settings.echo_sql,
+        future=True,
+        poolclass=TimedQueuePool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,
+    )
+
+
 settings = get_settings()
-engine = create_async_engine(settings.database_url, echo=settings.echo_sql, future=True)
+engine = _create_engine(settings.database_url)
 SessionLocal = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
 
+# optional read replica for the reporting / read-only endpoints
+read_engine = _create_engine(settings.read_database_url) if settings.read_database_url else None
+ReadSessionLocal = async_sessionmaker(read_engine, expire_on_commit=False, class_=AsyncSession) if read_engine else None
+replica_monitor = (
+    ReplicaMonitor(
+        read_engine, settings.read_max_lag_seconds, settings.read_check_interval, settings.read_check_timeout
+    )
+    if read_engine
+    else None
+)
+
 
 async def get_session() -> AsyncSession:
     async with SessionLocal() as session:
         yield session
 
 
-__all__ = ["AsyncSession", "SessionLocal", "engine", "Base", "get_session"]
+async def read_sessionmaker() -> async_sessionmaker:
+    """The replica's sessionmaker, or the primary's when there is no replica or it is down/lagging and fallback is on."""
+    if ReadSessionLocal is None:
+        return SessionLocal
+    if settings.read_fallback_to_primary and not await replica_monitor.available():
+        return SessionLocal
+    return ReadSessionLocal
+
+
+async def get_read_session() -> AsyncSession:
+    """Session for endpoints that only read; may lag behind writes by up to READ_MAX_LAG_SECONDS."""
+    async with (await read_sessionmaker())() as session:
+        yield session
+
+
+def on_replica(session: AsyncSession) -> bool:
+    return read_engine is not None and session.bind is read_engine
+
+
+def replica_lag_bound() -> float | None:
+    """
+    The longest the replica can be behind while reads use it: the lag limit plus the age of the
+    health verdict, which is served while its replacement is checked. None when the lag isn't checked.
+    """
+    if not settings.read_max_lag_seconds:
+        return None
+    return settings.read_max_lag_seconds + settings.read_check_interval + settings.read_check_timeout
+
+
+async def warm_up_pool(target: AsyncEngine, connections: int) -> None:
+    """Open up to `connections` pooled connections at once so the first requests don't pay connection setup."""
+    connections = min(connections, target.sync_engine.pool.size())
+    if connections <= 0:
+        return
+    results = await asyncio.gather(*(target.connect().start() for _ in range(connections)), return_exceptions=True)
+    opened = [conn for conn in results if not isinstance(conn, BaseException)]
+    for conn in opened:
+        await conn.close()
+    if len(opened) < connections:
+        error = next(result for result in results if isinstance(result, BaseException))
+        logger.warning("Opened %d of %d pool connections at startup: %s", len(opened), connections, error)
+
+
+__all__ = [
+    "AsyncSession",
+    "SessionLocal",
+    "ReadSessionLocal",
+    "engine",
+    "read_engine",
+    "replica_monitor",
+    "Base",
+    "get_session",
+    "get_read_session",
+    "read_sessionmaker",
+    "on_replica",
+    "replica_lag_bound",
+    "warm_up_pool",
+]
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Callable, Iterator
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from src.core.metrics import POOL_WAIT, SQL_DURATION
+from src.core.slow_queries import slow_query_log
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class QueryStats:
+    statements: int = 0
+    rows: int = 0
+    db_time: float = 0.0
+    pool_wait: float = 0.0
+    parent: QueryStats | None = field(default=None, repr=False)
+
+
+@dataclass(frozen=True)
+class QueryBudget:
+    statements: int
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+_current_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+_current_scope: ContextVar[dict | None] = ContextVar("request_scope", default=None)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """
+    Collect statements, rows and DB time of everything executed in this context (task and its children).
+    Nested trackers each see the statements of their own block; enclosing ones keep counting too.
+    """
+    stats = QueryStats(parent=_current_stats.get())
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context.query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context.query_started
+    SQL_DURATION.observe(elapsed)
+    slow_query_log.observe(conn.engine, statement, parameters, elapsed, executemany, _route_label(_current_scope.get()))
+    # rows returned (buffered cursors) or affected; unknown (-1) for server-side cursors
+    rows = max(cursor.rowcount, 0)
+    stats = _current_stats.get()
+    while stats is not None:
+        stats.statements += 1
+        stats.rows += rows
+        stats.db_time += elapsed
+        stats = stats.parent
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited for a free connection (or opened a new one)."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = time.perf_counter() - started
+            POOL_WAIT.observe(waited)
+            stats = _current_stats.get()
+            while stats is not None:
+                stats.pool_wait += waited
+                stats = stats.parent
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    slow_query_log.bind(engine)
+    if not event.contains(engine.sync_engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def query_budget(statements: int) -> Callable:
+    """Declare the most SQL statements one call of the decorated endpoint may execute."""
+
+    def decorate(endpoint: Callable) -> Callable:
+        endpoint.__query_budget__ = QueryBudget(statements=statements)
+        return endpoint
+
+    return decorate
+
+
+def endpoint_budget(endpoint: Callable | None) -> QueryBudget | None:
+    return getattr(endpoint, "__query_budget__", None)
+
+
+def assert_query_budget(stats: QueryStats, budget: QueryBudget, label: str) -> None:
+    if stats.statements > budget.statements:
+        raise QueryBudgetExceeded(
+            f"{label} executed {stats.statements} SQL statements, budget is {budget.statements}"
+        )
+
+
+def _route_label(scope: dict | None) -> str | None:
+    if scope is None:
+        return None
+    route = scope.get("route")
+    return f"{scope['method']} {route.path if route is not None else scope['path']}"
+
+
+class QueryStatsMiddleware:
+    """
+    Tracks the SQL executed while serving each HTTP request (streamed bodies included),
+    exposes it as scope["state"]["query_stats"], logs it, and warns when the endpoint
+    goes over its declared query_budget.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = _current_scope.set(scope)
+        with track_queries() as stats:
+            scope.setdefault("state", {})["query_stats"] = stats
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                _current_scope.reset(token)
+                self._report(scope, stats)
+
+    @staticmethod
+    def _report(scope, stats: QueryStats) -> None:
+        label = _route_label(scope)
+        logger.debug(
+            "%s: %d statements, %d rows, %.1f ms in DB",
+            label,
+            stats.statements,
+            stats.rows,
+            stats.db_time * 1000,
+            extra={"route": label, "statements": stats.statements, "rows": stats.rows, "db_time": stats.db_time},
+        )
+        budget = endpoint_budget(scope.get("endpoint"))
+        if budget is not None and stats.statements > budget.statements:
+            logger.warning("%s executed %d SQL statements, budget is %d", label, stats.statements, budget.statements)
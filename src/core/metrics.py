@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Callable
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+from prometheus_client import CONTENT_TYPE_LATEST, Gauge, Histogram, generate_latest
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Time until the response headers are sent, per route",
+    ["method", "route", "status"],
+)
+REQUESTS_IN_FLIGHT = Gauge("http_requests_in_flight", "HTTP requests being served")
+SQL_DURATION = Histogram(
+    "db_statement_duration_seconds",
+    "Time spent executing one SQL statement",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+POOL_WAIT = Histogram(
+    "db_pool_wait_seconds",
+    "Time spent waiting for a pooled connection",
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30),
+)
+POOL_CHECKED_OUT = Gauge("db_pool_checked_out", "Connections currently checked out of the pool", ["engine"])
+POOL_OVERFLOW = Gauge(
+    "db_pool_overflow", "Connections open beyond the pool size (negative: unopened pool slots)", ["engine"]
+)
+POOL_SIZE = Gauge("db_pool_size", "Configured pool size", ["engine"])
+
+
+@dataclass
+class RequestTiming:
+    handler: float = 0.0
+    endpoint: float = 0.0
+
+
+_current_timing: ContextVar[RequestTiming | None] = ContextVar("request_timing", default=None)
+
+
+class TimedRoute(APIRoute):
+    """
+    Records how long the route handler and the endpoint function itself take, so the
+    rest of the handler (parameter parsing, response validation and serialization)
+    can be reported separately.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        call = self.dependant.call
+        # the handler decides between await and threadpool from the original function, so only wrap coroutines
+        if asyncio.iscoroutinefunction(call):
+
+            @functools.wraps(call)
+            async def timed_call(**values):
+                started = time.perf_counter()
+                try:
+                    return await call(**values)
+                finally:
+                    timing = _current_timing.get()
+                    if timing is not None:
+                        timing.endpoint += time.perf_counter() - started
+
+            self.dependant.call = timed_call
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def timed_handler(request: Request) -> Response:
+            started = time.perf_counter()
+            try:
+                return await handler(request)
+            finally:
+                timing = _current_timing.get()
+                if timing is not None:
+                    timing.handler += time.perf_counter() - started
+
+        return timed_handler
+
+
+class ServerTimingMiddleware:
+    """
+    Adds a Server-Timing header (db, pool-wait, serialize, total) to every response and
+    feeds the request latency / in-flight metrics. Must run inside QueryStatsMiddleware,
+    whose per-request stats provide the db and pool-wait figures. For streamed bodies
+    the figures cover the time until the headers are sent.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        timing = RequestTiming()
+        token = _current_timing.set(timing)
+        status_code = 500
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", self._header(scope, timing, started).encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            REQUESTS_IN_FLIGHT.dec()
+            _current_timing.reset(token)
+            route = scope.get("route")
+            REQUEST_LATENCY.labels(
+                method=scope["method"],
+                route=route.path if route is not None else "unmatched",
+                status=str(status_code),
+            ).observe(time.perf_counter() - started)
+
+    @staticmethod
+    def _header(scope, timing: RequestTiming, started: float) -> str:
+        stats = scope.get("state", {}).get("query_stats")
+        metrics = []
+        if stats is not None:
+            metrics.append(f"db;dur={stats.db_time * 1000:.1f}")
+            metrics.append(f"pool-wait;dur={stats.pool_wait * 1000:.1f}")
+        if timing.handler:
+            metrics.append(f"serialize;dur={max(timing.handler - timing.endpoint, 0) * 1000:.1f}")
+        metrics.append(f"total;dur={(time.perf_counter() - started) * 1000:.1f}")
+        return ", ".join(metrics)
+
+
+def register_pool_metrics(engine: AsyncEngine, name: str) -> None:
+    """Pool gauges, labelled engine=name, are read from the engine at scrape time."""
+    pool = engine.sync_engine.pool
+    if hasattr(pool, "checkedout"):
+        POOL_CHECKED_OUT.labels(engine=name).set_function(pool.checkedout)
+        POOL_OVERFLOW.labels(engine=name).set_function(pool.overflow)
+        POOL_SIZE.labels(engine=name).set_function(pool.size)
+
+
+def metrics_response() -> Response:
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import logging
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+LAG_QUERIES = (
+    ("SHOW REPLICA STATUS", "Seconds_Behind_Source"),
+    # MySQL before 8.0.22
+    ("SHOW SLAVE STATUS", "Seconds_Behind_Master"),
+)
+
+
+class ReplicaMonitor:
+    """
+    Decides whether reads may go to the replica: it must answer, and (when max_lag is set)
+    be no more than max_lag seconds behind its source. The verdict is reused for
+    check_interval seconds; once it is older, the next caller starts one background check
+    (bounded by timeout) and every caller keeps getting the previous verdict meanwhile, so
+    a replica that stops answering never stalls requests. Until the first check finishes
+    the replica counts as unavailable. A server that reports no replication status at all
+    (e.g. a second standalone instance in local testing) counts as not lagging.
+    """
+
+    def __init__(self, engine: AsyncEngine, max_lag: float, check_interval: float, timeout: float):
+        self.engine = engine
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.timeout = timeout
+        self._available = False
+        self._checked_at: float | None = None
+        self._refresh_task: asyncio.Task | None = None
+
+    async def available(self) -> bool:
+        if not self._fresh() and (self._refresh_task is None or self._refresh_task.done()):
+            # an empty context keeps the health check out of the current request's query stats
+            self._refresh_task = asyncio.create_task(self.refresh(), context=contextvars.Context())
+        return self._available
+
+    async def refresh(self) -> None:
+        self._available = await self._check()
+        self._checked_at = time.monotonic()
+
+    def _fresh(self) -> bool:
+        return self._checked_at is not None and time.monotonic() - self._checked_at < self.check_interval
+
+    async def _check(self) -> bool:
+        try:
+            async with asyncio.timeout(self.timeout):
+                async with self.engine.connect() as conn:
+                    await conn.execute(text("SELECT 1"))
+                    lag = await self._lag(conn) if self.max_lag else None
+        except Exception as exc:
+            if self._available or self._checked_at is None:
+                logger.warning("Read replica unavailable, reading from the primary: %r", exc)
+            return False
+
+        if lag is not None and lag > self.max_lag:
+            if self._available or self._checked_at is None:
+                logger.warning("Read replica is %s s behind (max %s s), reading from the primary", lag, self.max_lag)
+            return False
+        if not self._available and self._checked_at is not None:
+            logger.info("Read replica is back, reading from it again")
+        return True
+
+    @staticmethod
+    async def _lag(conn) -> float | None:
+        last_error = None
+        for query, column in LAG_QUERIES:
+            try:
+                row = (await conn.exec_driver_sql(query)).mappings().first()
+            except Exception as exc:
+                last_error = exc
+                continue
+            if row is None:
+                return None
+            lag = row.get(column)
+            if lag is None:
+                # replication threads stopped: the replica is not catching up at all
+                raise RuntimeError("replication is not running")
+            return float(lag)
+        raise RuntimeError(f"cannot read replication status: {last_error}")
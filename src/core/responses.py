@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import typing
+from typing import Any
+
+import pydantic_core
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+
+from src.core.compression import header_qualities
+
+try:
+    import msgpack
+except ImportError:  # optional: pip install msgpack
+    msgpack = None
+
+JSON = "application/json"
+# lists of items sent as one array per field: {"items": {"month": [1, 2, ...], "year": [...]}}
+COLUMNAR_JSON = "application/vnd.columnar+json"
+MSGPACK = "application/msgpack"
+MSGPACK_ALIASES = {MSGPACK, "application/x-msgpack"}
+
+
+class ModelJSONResponse(JSONResponse):
+    """
+    Renders a pydantic model straight to JSON bytes with the model's own pydantic-core
+    serializer. An endpoint that returns it instead of the bare model skips FastAPI's
+    response_model pass (re-validating every item, then jsonable_encoder walking the dump)
+    and the stdlib json encoder; response_model still documents the schema.
+
+    The output is the same JSON as before: decimals as strings, dates as ISO strings,
+    integer dict keys as strings, non-ASCII text unescaped. Only wrap models built from
+    data the service already trusts, since nothing is validated on the way out.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.__pydantic_serializer__.to_json(content)
+        return super().render(content)
+
+
+def _item_model(annotation: Any) -> type[BaseModel] | None:
+    """The item model of a List[Model] field, else None."""
+    args = typing.get_args(annotation)
+    if typing.get_origin(annotation) is list and len(args) == 1:
+        if isinstance(args[0], type) and issubclass(args[0], BaseModel):
+            return args[0]
+    return None
+
+
+def columnar(model: BaseModel) -> dict[str, Any]:
+    """The model's fields, with every list of items turned into one list per item field."""
+    content = {}
+    for name, info in type(model).model_fields.items():
+        value = getattr(model, name)
+        item_model = _item_model(info.annotation)
+        if item_model is None:
+            content[name] = value
+        else:
+            content[name] = {field: [getattr(item, field) for item in value] for field in item_model.model_fields}
+    return content
+
+
+class ColumnarJSONResponse(Response):
+    """Column-per-field JSON; values are encoded like ModelJSONResponse does (decimals as strings)."""
+
+    media_type = COLUMNAR_JSON
+
+    def render(self, content: BaseModel) -> bytes:
+        return pydantic_core.to_json(columnar(content))
+
+
+class MsgPackResponse(Response):
+    """The model's JSON form packed as MessagePack; needs the msgpack package."""
+
+    media_type = MSGPACK
+
+    def render(self, content: BaseModel) -> bytes:
+        return msgpack.packb(content.model_dump(mode="json"))
+
+
+def report_media_types() -> list[str]:
+    return [JSON, COLUMNAR_JSON] + ([MSGPACK] if msgpack is not None else [])
+
+
+def negotiate(accept: str | None) -> str:
+    """
+    The supported media type the Accept header ranks highest (JSON for */* and application/*);
+    JSON when it names none of them, so clients that send no or an unrelated Accept are unaffected.
+    """
+    available = report_media_types()
+    best, best_rank = JSON, (0.0, False)
+    for media_type, quality in header_qualities(accept or ""):
+        wildcard = media_type in ("*/*", "application/*")
+        if wildcard:
+            media_type = JSON
+        elif media_type in MSGPACK_ALIASES:
+            media_type = MSGPACK
+        # on equal q an explicitly named type beats a wildcard
+        rank = (quality, not wildcard)
+        if media_type in available and quality > 0 and rank > best_rank:
+            best, best_rank = media_type, rank
+    return best
+
+
+def report_response(model: BaseModel, accept: str | None) -> Response:
+    """The model as JSON, columnar JSON or MessagePack, whichever the client prefers."""
+    media_type = negotiate(accept)
+    headers = {"Vary": "Accept"}
+    if media_type == COLUMNAR_JSON:
+        return ColumnarJSONResponse(model, headers=headers)
+    if media_type == MSGPACK:
+        return MsgPackResponse(model, headers=headers)
+    return ModelJSONResponse(model, headers=headers)
+
+
+# OpenAPI `responses` entry for endpoints answering through report_response
+REPORT_RESPONSES = {
+    200: {
+        "content": {COLUMNAR_JSON: {}, MSGPACK: {}},
+        "description": f"JSON; one array per item field for Accept: {COLUMNAR_JSON}; "
+        f"MessagePack for Accept: {MSGPACK} (when msgpack is installed)",
+    }
+}
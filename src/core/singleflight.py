@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls: the first caller for a key runs the computation,
+    callers arriving while it is in flight wait for and share its result (or exception).
+    Keys are tuples whose first item names the endpoint; counters are kept per endpoint.
+    With enabled set to False every call computes on its own (benchmarks without the cache).
+    """
+
+    def __init__(self):
+        self.enabled = True
+        self._in_flight: dict[Hashable, asyncio.Future] = {}
+        self.leaders: Counter[str] = Counter()
+        self.coalesced: Counter[str] = Counter()
+
+    async def do(self, key: tuple, compute: Callable[[], Awaitable[Any]]) -> Any:
+        if not self.enabled:
+            return await compute()
+        endpoint = str(key[0])
+        while True:
+            future = self._in_flight.get(key)
+            if future is None:
+                break
+            self.coalesced[endpoint] += 1
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # the leader was cancelled (e.g. its client went away): retry unless we were too
+                if not future.cancelled() or asyncio.current_task().cancelling():
+                    raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        self.leaders[endpoint] += 1
+        try:
+            result = await compute()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # mark retrieved: with no waiters asyncio would log "exception was never retrieved"
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._in_flight[key]
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        in_flight = Counter(str(key[0]) for key in self._in_flight)
+        endpoints = sorted(set(self.leaders) | set(self.coalesced))
+        return {
+            endpoint: {
+                "leaders": self.leaders[endpoint],
+                "coalesced": self.coalesced[endpoint],
+                "in_flight": in_flight[endpoint],
+            }
+            for endpoint in endpoints
+        }
+
+
+report_flights = SingleFlight()
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import json
+import logging
+from collections import deque
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import Any
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# EXPLAINs running at once; slow statements beyond that are recorded without a plan
+MAX_CONCURRENT_EXPLAINS = 2
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): _jsonable(item) for key, item in value.items()}
+    if isinstance(value, (date, Decimal)):
+        return str(value)
+    if isinstance(value, bytes):
+        return value.hex()
+    return value
+
+
+class SlowQueryLog:
+    """
+    Keeps the last slow_query_log_size statements that took longer than slow_query_threshold
+    seconds, with their parameters, the route that ran them and an EXPLAIN taken on a separate
+    connection. Each record is also logged as one JSON line. Not shared between worker processes.
+    """
+
+    def __init__(self, size: int, threshold: float):
+        self.threshold = threshold
+        self.records: deque[dict] = deque(maxlen=size)
+        self.engines: dict[Engine, AsyncEngine] = {}
+        self._explains: set[asyncio.Task] = set()
+
+    def bind(self, engine: AsyncEngine) -> None:
+        self.engines[engine.sync_engine] = engine
+
+    def observe(
+        self,
+        engine: Engine,
+        statement: str,
+        parameters: Any,
+        elapsed: float,
+        executemany: bool,
+        route: str | None,
+    ) -> None:
+        """Called for every executed statement from the engine's after_cursor_execute hook."""
+        if not self.threshold or elapsed < self.threshold or statement.lstrip().upper().startswith("EXPLAIN"):
+            return
+
+        record = {
+            "at": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+            "route": route,
+            "duration_ms": round(elapsed * 1000, 1),
+            "statement": statement,
+            "parameters": _jsonable(parameters) if not executemany else f"<executemany, {len(parameters)} rows>",
+            "explain": None,
+            "explain_error": None,
+        }
+        self.records.append(record)
+
+        explainable = not executemany and statement.lstrip().upper().startswith("SELECT")
+        target = self.engines.get(engine)
+        if explainable and target is not None and len(self._explains) < MAX_CONCURRENT_EXPLAINS:
+            # hooks run synchronously inside the statement's greenlet, so the plan is fetched by a task;
+            # an empty context keeps the EXPLAIN out of the request's query stats
+            task = asyncio.get_running_loop().create_task(
+                self._explain(target, record, statement, parameters), context=contextvars.Context()
+            )
+            self._explains.add(task)
+            task.add_done_callback(self._explains.discard)
+            return
+        self._log(record)
+
+    async def _explain(self, target: AsyncEngine, record: dict, statement: str, parameters: Any) -> None:
+        try:
+            async with target.connect() as conn:
+                result = await conn.exec_driver_sql(f"EXPLAIN {statement}", parameters)
+                record["explain"] = [_jsonable(dict(row._mapping)) for row in result]
+        except Exception as exc:
+            record["explain_error"] = f"{type(exc).__name__}: {exc}"
+        self._log(record)
+
+    @staticmethod
+    def _log(record: dict) -> None:
+        logger.warning("slow query %s", json.dumps(record, ensure_ascii=False), extra={"slow_query": record})
+
+    def entries(self) -> list[dict]:
+        return list(reversed(self.records))
+
+
+slow_query_log = SlowQueryLog(get_settings().slow_query_log_size, get_settings().slow_query_threshold)
@@ -1,11 +1,59 @@
+from contextlib import asynccontextmanager
+
 import uvicorn
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 
 from src.api.routers import router as api_router
+from src.core.compression import CompressionMiddleware
 from src.core.config import get_settings
+from src.core.database import engine, read_engine, replica_monitor, warm_up_pool
+from src.core.instrumentation import QueryStatsMiddleware, instrument_engine
+from src.core.metrics import ServerTimingMiddleware, metrics_response, register_pool_metrics
+from src.services.categories import category_registry
+from src.services.plans_file import shutdown_parse_pool
+from src.services.plans_jobs import import_job_heartbeat
+from src.services.report_versions import report_version_watcher
 
 settings = get_settings()
-app = FastAPI(title=settings.app_name, debug=settings.debug)
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    await warm_up_pool(engine, settings.db_pool_warmup)
+    if read_engine is not None:
+        await warm_up_pool(read_engine, settings.db_pool_warmup)
+        # first verdict before serving; afterwards checks run in the background
+        await replica_monitor.refresh()
+    await category_registry.start()
+    await report_version_watcher.start()
+    await import_job_heartbeat.start()
+    yield
+    await import_job_heartbeat.stop()
+    await report_version_watcher.stop()
+    await category_registry.stop()
+    shutdown_parse_pool()
+    await engine.dispose()
+    if read_engine is not None:
+        await read_engine.dispose()
+
+
+app = FastAPI(title=settings.app_name, debug=settings.debug, lifespan=lifespan)
+# the last middleware added runs outermost: query stats wrap the timing that reports them,
+# and compression runs inside the timing so it counts towards total
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.compression_min_size,
+    gzip_level=settings.compression_gzip_level,
+    brotli_quality=settings.compression_brotli_quality,
+)
+app.add_middleware(ServerTimingMiddleware)
+app.add_middleware(QueryStatsMiddleware)
+instrument_engine(engine)
+if read_engine is not None:
+    instrument_engine(read_engine)
+register_pool_metrics(engine, "primary")
+if read_engine is not None:
+    register_pool_metrics(read_engine, "replica")
 
 app.include_router(api_router)
 
@@ -15,5 +63,10 @@ async def health() -> dict[str, str]:
     return {"status": "ok"}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    return metrics_response()
+
+
 if __name__ == "__main__":
     uvicorn.run("src.main:app", host="0.0.0.0", port=8000, reload=True)
@@ -1,13 +1,22 @@
 from src.models.credit import Credit
+from src.models.daily_totals import DailyIssuanceTotal, DailyPaymentTotal
 from src.models.dictionary import Dictionary
+from src.models.idempotency_key import IdempotencyKey
 from src.models.payment import Payment
 from src.models.plan import Plan
+from src.models.plan_import_job import PlanImportJob
+from src.models.report_cache_version import ReportCacheVersion
 from src.models.user import User
 
 __all__ = [
     "Credit",
+    "DailyIssuanceTotal",
+    "DailyPaymentTotal",
     "Dictionary",
+    "IdempotencyKey",
     "Payment",
     "Plan",
+    "PlanImportJob",
+    "ReportCacheVersion",
     "User",
 ]
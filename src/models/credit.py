@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import date
 from decimal import Decimal
 
-from sqlalchemy import Date, ForeignKey, Numeric
+from sqlalchemy import Date, ForeignKey, Index, Numeric
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.core.database import Base
@@ -11,6 +11,11 @@ from src.core.database import Base
 
 class Credit(Base):
     __tablename__ = "credits"
+    __table_args__ = (
+        Index("ix_credits_user_id", "user_id"),
+        Index("ix_credits_issuance_date_body", "issuance_date", "body"),
+        Index("ix_credits_actual_return_date", "actual_return_date", "return_date", "issuance_date"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
@@ -19,6 +24,10 @@ class Credit(Base):
     actual_return_date: Mapped[date | None] = mapped_column(Date, nullable=True)
     body: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable=False)
     percent: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable=False)
+    # running payment totals, maintained by CreditBalancesService
+    body_paid: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable=False, default=0, server_default="0")
+    percent_paid: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable=False, default=0, server_default="0")
+    last_payment_date: Mapped[date | None] = mapped_column(Date, nullable=True)
 
     user: Mapped["User"] = relationship(back_populates="credits")
     payments: Mapped[list["Payment"]] = relationship(back_populates="credit", cascade="all, delete-orphan")
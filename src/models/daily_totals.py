@@ -0,0 +1,29 @@
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import Date, Integer, Numeric
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.core.database import Base
+
+
+class DailyIssuanceTotal(Base):
+    __tablename__ = "daily_issuance_totals"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    issuance_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    issuance_sum: Mapped[Decimal] = mapped_column(Numeric(16, 2), nullable=False, default=0)
+
+    def __repr__(self) -> str:  # pragma: no cover - for debug only
+        return f"DailyIssuanceTotal(day={self.day}, issuance_sum={self.issuance_sum})"
+
+
+class DailyPaymentTotal(Base):
+    __tablename__ = "daily_payment_totals"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    payment_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    payment_sum: Mapped[Decimal] = mapped_column(Numeric(16, 2), nullable=False, default=0)
+
+    def __repr__(self) -> str:  # pragma: no cover - for debug only
+        return f"DailyPaymentTotal(day={self.day}, payment_sum={self.payment_sum})"
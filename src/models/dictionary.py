@@ -9,6 +9,8 @@ class Dictionary(Base):
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
+    # body / percent (payment types), issuance / collection (plan categories); NULL for imported categories
+    category_kind: Mapped[str | None] = mapped_column(String(20), nullable=True)
 
     def __repr__(self) -> str:  # pragma: no cover - for debug only
-        return f"Dictionary(id={self.id}, name={self.name})"
+        return f"Dictionary(id={self.id}, name={self.name}, category_kind={self.category_kind})"
@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import date
 from decimal import Decimal
 
-from sqlalchemy import Date, ForeignKey, Numeric
+from sqlalchemy import Date, ForeignKey, Index, Numeric
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.core.database import Base
@@ -11,6 +11,10 @@ from src.core.database import Base
 
 class Payment(Base):
     __tablename__ = "payments"
+    __table_args__ = (
+        Index("ix_payments_credit_type_sum", "credit_id", "type_id", "sum"),
+        Index("ix_payments_date_sum", "payment_date", "sum"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     sum: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable=False)
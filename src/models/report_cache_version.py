@@ -0,0 +1,22 @@
+from sqlalchemy import DDL, BigInteger, Integer, event
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.core.database import Base
+
+
+class ReportCacheVersion(Base):
+    """Single row (id 1) bumped by every write that changes report results; workers poll it."""
+
+    __tablename__ = "report_cache_version"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+    def __repr__(self) -> str:  # pragma: no cover - for debug only
+        return f"ReportCacheVersion(version={self.version})"
+
+
+# tables created with metadata.create_all (seed script) get the row as well
+event.listen(
+    ReportCacheVersion.__table__, "after_create", DDL("INSERT INTO report_cache_version (id, version) VALUES (1, 0)")
+)
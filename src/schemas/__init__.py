@@ -1,20 +1,40 @@
+from src.schemas.requests import UserCreditsBatchRequest
 from src.schemas.responses import (
+    BulkIngestResponse,
+    CacheStatsResponse,
+    CoalescingStats,
     CreditClosedInfo,
     CreditOpenInfo,
+    IngestBatch,
+    PerformanceSeriesResponse,
+    PlanImportError,
+    PlanImportJobResponse,
     PlanInsertResponse,
     PlanPerformanceItem,
     PlansPerformanceResponse,
+    SlowQueryRecord,
+    UserCreditsBatchResponse,
     UserCreditsResponse,
     YearPerformanceItem,
     YearPerformanceResponse,
 )
 
 __all__ = [
+    "BulkIngestResponse",
+    "CacheStatsResponse",
+    "CoalescingStats",
     "CreditClosedInfo",
     "CreditOpenInfo",
+    "IngestBatch",
+    "PerformanceSeriesResponse",
+    "PlanImportError",
+    "PlanImportJobResponse",
     "PlanInsertResponse",
     "PlanPerformanceItem",
     "PlansPerformanceResponse",
+    "SlowQueryRecord",
+    "UserCreditsBatchRequest",
+    "UserCreditsBatchResponse",
     "UserCreditsResponse",
     "YearPerformanceItem",
     "YearPerformanceResponse",
@@ -0,0 +1,7 @@
+from typing import List
+
+from pydantic import BaseModel, Field
+
+
+class UserCreditsBatchRequest(BaseModel):
+    user_ids: List[int] = Field(..., min_length=1)
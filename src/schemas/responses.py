@@ -1,6 +1,6 @@
-from datetime import date
+from datetime import date, datetime
 from decimal import Decimal
-from typing import List, Union
+from typing import Any, Dict, List, Union
 
 from pydantic import BaseModel, ConfigDict
 
@@ -30,15 +30,41 @@ class CreditOpenInfo(CreditBase):
 
 class UserCreditsResponse(BaseModel):
     credits: List[Union[CreditClosedInfo, CreditOpenInfo]]
+    next_after_id: int | None = None
 
     model_config = ConfigDict(from_attributes=True)
 
 
+class UserCreditsBatchResponse(BaseModel):
+    results: Dict[int, UserCreditsResponse]
+
+
 class PlanInsertResponse(BaseModel):
     inserted: int
+    updated: int = 0
     message: str
 
 
+class PlanImportError(BaseModel):
+    row: int | None
+    field: str
+    error: str
+
+
+class PlanImportJobResponse(BaseModel):
+    id: str
+    status: str
+    mode: str
+    filename: str | None
+    rows_parsed: int
+    rows_inserted: int
+    rows_updated: int
+    rows_rejected: int
+    elapsed_seconds: float
+    message: str | None
+    errors: List[PlanImportError]
+
+
 class PlanPerformanceItem(BaseModel):
     period: date
     category: str
@@ -68,3 +94,67 @@ class YearPerformanceItem(BaseModel):
 
 class YearPerformanceResponse(BaseModel):
     items: List[YearPerformanceItem]
+
+
+class PerformanceSeriesResponse(BaseModel):
+    months: List[YearPerformanceItem]
+    plans: List[PlanPerformanceItem]
+
+
+class CacheStatsResponse(BaseModel):
+    size: int
+    maxsize: int
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    invalidations: int
+
+
+class CoalescingStats(BaseModel):
+    leaders: int
+    coalesced: int
+    in_flight: int
+
+
+class SlowQueryRecord(BaseModel):
+    at: datetime
+    route: str | None
+    duration_ms: float
+    statement: str
+    parameters: Any
+    explain: List[Dict[str, Any]] | None
+    explain_error: str | None
+
+
+class AgingBucket(BaseModel):
+    bucket: str
+    credits: int
+    outstanding_body: Decimal
+    outstanding_percent: Decimal
+
+
+class AgingGroup(BaseModel):
+    issuance_month: date
+    buckets: List[AgingBucket]
+
+
+class PortfolioAgingResponse(BaseModel):
+    as_of: date
+    buckets: List[AgingBucket]
+    groups: List[AgingGroup] | None = None
+
+
+class IngestBatch(BaseModel):
+    index: int
+    rows: int
+    status: str
+    elapsed_ms: float
+
+
+class BulkIngestResponse(BaseModel):
+    received: int
+    inserted: int
+    replayed: int
+    elapsed_ms: float
+    batches: List[IngestBatch]
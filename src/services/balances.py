@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from decimal import Decimal
+from typing import Iterable
+
+from sqlalchemy import bindparam, case, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.credit import Credit
+from src.models.payment import Payment
+from src.services.categories import category_registry
+
+credits_table = Credit.__table__
+
+
+class CreditBalancesService:
+    """
+    Keeps credits.body_paid / percent_paid / last_payment_date equal to what payments add up to.
+    Writers call record_payments in the same transaction as their payment insert;
+    reconcile compares (and optionally repairs) the columns against payments.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def record_payments(self, rows: Iterable[dict]) -> None:
+        """rows: inserted payments with credit_id, type_id, sum and payment_date; one executemany UPDATE."""
+        categories = await category_registry.current(self.session)
+        body_type_id, percent_type_id = categories.id_for("body"), categories.id_for("percent")
+        deltas: dict[int, dict] = defaultdict(lambda: {"body": Decimal("0"), "percent": Decimal("0"), "last": None})
+        for row in rows:
+            delta = deltas[row["credit_id"]]
+            if row["type_id"] == body_type_id:
+                delta["body"] += Decimal(row["sum"])
+            elif row["type_id"] == percent_type_id:
+                delta["percent"] += Decimal(row["sum"])
+            if delta["last"] is None or row["payment_date"] > delta["last"]:
+                delta["last"] = row["payment_date"]
+        if not deltas:
+            return
+
+        last_date = bindparam("p_last_payment_date")
+        stmt = (
+            update(credits_table)
+            .where(credits_table.c.id == bindparam("p_credit_id"))
+            .values(
+                body_paid=credits_table.c.body_paid + bindparam("p_body"),
+                percent_paid=credits_table.c.percent_paid + bindparam("p_percent"),
+                last_payment_date=func.greatest(func.coalesce(credits_table.c.last_payment_date, last_date), last_date),
+            )
+        )
+        await self.session.execute(
+            stmt,
+            [
+                {
+                    "p_credit_id": credit_id,
+                    "p_body": delta["body"],
+                    "p_percent": delta["percent"],
+                    "p_last_payment_date": delta["last"],
+                }
+                for credit_id, delta in deltas.items()
+            ],
+        )
+
+    async def rebuild(self) -> None:
+        """Recompute the columns for every credit with two set-based UPDATEs."""
+        totals = await self._payment_totals()
+        await self.session.execute(update(credits_table).values(body_paid=0, percent_paid=0, last_payment_date=None))
+        await self.session.execute(
+            update(credits_table)
+            .where(credits_table.c.id == totals.c.credit_id)
+            .values(
+                body_paid=totals.c.body_paid,
+                percent_paid=totals.c.percent_paid,
+                last_payment_date=totals.c.last_payment_date,
+            )
+        )
+
+    async def reconcile(self, fix: bool = False) -> list[dict]:
+        """Credits whose stored balances disagree with payments; with fix=True they are corrected."""
+        totals = await self._payment_totals()
+        expected_body = func.coalesce(totals.c.body_paid, 0)
+        expected_percent = func.coalesce(totals.c.percent_paid, 0)
+        rows = await self.session.execute(
+            select(
+                Credit.id,
+                Credit.body_paid,
+                Credit.percent_paid,
+                Credit.last_payment_date,
+                expected_body.label("expected_body_paid"),
+                expected_percent.label("expected_percent_paid"),
+                totals.c.last_payment_date.label("expected_last_payment_date"),
+            )
+            .outerjoin(totals, totals.c.credit_id == Credit.id)
+            .where(
+                (Credit.body_paid != expected_body)
+                | (Credit.percent_paid != expected_percent)
+                | Credit.last_payment_date.is_distinct_from(totals.c.last_payment_date)
+            )
+        )
+        mismatches = [dict(row._mapping) for row in rows]
+
+        if fix and mismatches:
+            await self.session.execute(
+                update(credits_table)
+                .where(credits_table.c.id == bindparam("p_credit_id"))
+                .values(
+                    body_paid=bindparam("p_body"),
+                    percent_paid=bindparam("p_percent"),
+                    last_payment_date=bindparam("p_last_payment_date"),
+                ),
+                [
+                    {
+                        "p_credit_id": row["id"],
+                        "p_body": row["expected_body_paid"],
+                        "p_percent": row["expected_percent_paid"],
+                        "p_last_payment_date": row["expected_last_payment_date"],
+                    }
+                    for row in mismatches
+                ],
+            )
+        return mismatches
+
+    async def _payment_totals(self):
+        categories = await category_registry.current(self.session)
+        body_type_id, percent_type_id = categories.id_for("body"), categories.id_for("percent")
+        return (
+            select(
+                Payment.credit_id,
+                func.sum(case((Payment.type_id == body_type_id, Payment.sum), else_=0)).label("body_paid"),
+                func.sum(case((Payment.type_id == percent_type_id, Payment.sum), else_=0)).label("percent_paid"),
+                func.max(Payment.payment_date).label("last_payment_date"),
+            )
+            .group_by(Payment.credit_id)
+            .subquery()
+        )
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Literal
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.config import get_settings
+from src.core.database import SessionLocal
+from src.models.dictionary import Dictionary
+
+logger = logging.getLogger(__name__)
+
+CategoryKind = Literal["body", "percent", "issuance", "collection"]
+
+# kinds of the categories shipped in data/dictionary.csv; categories created by plan imports have none
+DEFAULT_CATEGORY_KINDS: dict[str, CategoryKind] = {
+    "тіло": "body",
+    "відсотки": "percent",
+    "видача": "issuance",
+    "збір": "collection",
+}
+# kinds that must each name a category: payments are split into body and percent by them
+PAYMENT_KINDS: tuple[CategoryKind, ...] = ("body", "percent")
+
+
+class CategoryKindMissing(LookupError):
+    """No dictionary row has a kind the service needs; computing without it would count nothing as paid."""
+
+    def __init__(self, kind: CategoryKind):
+        super().__init__(f"No dictionary category has category_kind='{kind}'; set it on the matching category")
+        self.kind = kind
+
+
+@dataclass(frozen=True)
+class Categories:
+    """Immutable snapshot of the dictionary table."""
+
+    names: dict[int, str] = field(default_factory=dict)
+    kinds: dict[int, str | None] = field(default_factory=dict)
+    ids_by_name: dict[str, int] = field(default_factory=dict)
+
+    @classmethod
+    def from_rows(cls, rows) -> Categories:
+        names, kinds, ids_by_name = {}, {}, {}
+        for category_id, name, kind in rows:
+            names[category_id] = name
+            kinds[category_id] = kind
+            # dictionary.name compares case-insensitively in MySQL, so does the lookup
+            ids_by_name[name.lower()] = category_id
+        return cls(names=names, kinds=kinds, ids_by_name=ids_by_name)
+
+    def ids(self, *kinds: CategoryKind) -> frozenset[int]:
+        return frozenset(category_id for category_id, kind in self.kinds.items() if kind in kinds)
+
+    def id_for(self, kind: CategoryKind) -> int:
+        """The category of a kind that exists once (body, percent); raises CategoryKindMissing if there is none."""
+        ids = self.ids(kind)
+        if not ids:
+            raise CategoryKindMissing(kind)
+        return min(ids)
+
+    def id_for_name(self, name: str) -> int | None:
+        return self.ids_by_name.get(name.lower())
+
+
+class CategoryRegistry:
+    """
+    Process-wide copy of the dictionary table, so queries can filter by category id instead
+    of joining dictionary. Loaded at startup, reloaded every category_registry_ttl seconds
+    in the background and right after a transaction that created categories commits.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._categories: Categories | None = None
+        self._loaded_at = 0.0
+        self._refresh_task: asyncio.Task | None = None
+        self._reload_task: asyncio.Task | None = None
+
+    async def load(self, session: AsyncSession) -> Categories:
+        rows = await session.execute(select(Dictionary.id, Dictionary.name, Dictionary.category_kind))
+        self._categories = Categories.from_rows(rows.all())
+        self._loaded_at = time.monotonic()
+        missing = [kind for kind in PAYMENT_KINDS if not self._categories.ids(kind)]
+        if self._categories.names and missing:
+            logger.error("No dictionary category has category_kind %s; payment balances can't be computed", missing)
+        return self._categories
+
+    async def current(self, session: AsyncSession) -> Categories:
+        """The loaded snapshot; loads it with the given session if nothing was loaded yet (scripts, tests)."""
+        if self._categories is None:
+            return await self.load(session)
+        return self._categories
+
+    async def covering(self, session: AsyncSession, category_ids) -> Categories:
+        """A snapshot that knows every given id; reloads once if another worker created a category since."""
+        categories = await self.current(session)
+        if not categories.names.keys() >= set(category_ids):
+            categories = await self.load(session)
+        return categories
+
+    async def refresh(self) -> None:
+        async with SessionLocal() as session:
+            await self.load(session)
+
+    def reload_on_commit(self, session: AsyncSession) -> None:
+        """Reload once the session's current transaction commits, e.g. after inserting categories."""
+
+        def schedule(_) -> None:
+            self._categories = None
+            # own context: the reload is not part of the request that triggered it
+            self._reload_task = asyncio.get_running_loop().create_task(self.refresh(), context=contextvars.Context())
+
+        event.listen(session.sync_session, "after_commit", schedule, once=True)
+
+    async def run(self) -> None:
+        """Background loop started by the app lifespan."""
+        while True:
+            await asyncio.sleep(max(self.ttl - (time.monotonic() - self._loaded_at), 0))
+            try:
+                await self.refresh()
+            except Exception:
+                logger.exception("Reloading the category registry failed")
+                self._loaded_at = time.monotonic()
+
+    async def start(self) -> None:
+        try:
+            await self.refresh()
+        except Exception:
+            # requests load it lazily once the database answers
+            logger.exception("Loading the category registry at startup failed")
+        self._refresh_task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            self._refresh_task = None
+
+
+category_registry = CategoryRegistry(get_settings().category_registry_ttl)
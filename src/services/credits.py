@@ -1,62 +1,99 @@
 from datetime import date
 from decimal import Decimal
+from typing import AsyncIterator
 
-from sqlalchemy import case, func, select
+from sqlalchemy import Select, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.models.credit import Credit
-from src.models.payment import Payment
 from src.schemas.responses import CreditClosedInfo, CreditOpenInfo, UserCreditsResponse
 
+# Rows fetched per round trip from the server-side cursor when streaming.
+STREAM_BATCH_SIZE = 1000
+
 
 class CreditsService:
     def __init__(self, session: AsyncSession):
         self.session = session
 
-    async def get_user_credits(self, user_id: int) -> UserCreditsResponse:
-        result = await self.session.execute(
-            select(
-                Credit,
-                func.coalesce(func.sum(case((Payment.type_id == 1, Payment.sum), else_=0)), 0).label("body_paid"),
-                func.coalesce(func.sum(case((Payment.type_id == 2, Payment.sum), else_=0)), 0).label("percent_paid"),
+    async def get_user_credits(
+        self, user_id: int, limit: int | None = None, after_id: int | None = None
+    ) -> UserCreditsResponse:
+        """
+        Credits of one user ordered by id. With limit, returns one keyset page and
+        next_after_id to pass as after_id for the next one (None on the last page).
+        """
+        stmt = self._credits_query(user_id, after_id)
+        if limit is not None:
+            stmt = stmt.limit(limit + 1)
+        rows = (await self.session.scalars(stmt)).all()
+
+        next_after_id = None
+        if limit is not None and len(rows) > limit:
+            rows = rows[:limit]
+            next_after_id = rows[-1].id
+
+        today = date.today()
+        credits = [self._credit_info(credit, today) for credit in rows]
+        return UserCreditsResponse(credits=credits, next_after_id=next_after_id)
+
+    async def iter_user_credits(
+        self, user_id: int, after_id: int | None = None, limit: int | None = None
+    ) -> AsyncIterator[CreditClosedInfo | CreditOpenInfo]:
+        """Stream a user's credits from a server-side cursor without materializing the result."""
+        stmt = self._credits_query(user_id, after_id)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        today = date.today()
+        result = await self.session.stream_scalars(stmt.execution_options(yield_per=STREAM_BATCH_SIZE))
+        async for credit in result:
+            yield self._credit_info(credit, today)
+
+    async def get_users_credits(self, user_ids: list[int]) -> dict[int, UserCreditsResponse]:
+        """Credits of several users with one indexed query (user_id IN (...)), keyed by user id."""
+        result = await self.session.scalars(select(Credit).where(Credit.user_id.in_(user_ids)).order_by(Credit.id))
+
+        items: dict[int, list[CreditClosedInfo | CreditOpenInfo]] = {user_id: [] for user_id in user_ids}
+        today = date.today()
+
+        for credit in result.all():
+            items[credit.user_id].append(self._credit_info(credit, today))
+
+        return {user_id: UserCreditsResponse(credits=credits) for user_id, credits in items.items()}
+
+    @staticmethod
+    def _credits_query(user_id: int, after_id: int | None) -> Select:
+        # (user_id, id) order comes straight from ix_credits_user_id, so keyset pages are index range reads;
+        # payment totals are the denormalized columns kept by CreditBalancesService, so no join or GROUP BY
+        stmt = select(Credit).where(Credit.user_id == user_id).order_by(Credit.id)
+        if after_id is not None:
+            stmt = stmt.where(Credit.id > after_id)
+        return stmt
+
+    @staticmethod
+    def _credit_info(credit: Credit, today: date) -> CreditClosedInfo | CreditOpenInfo:
+        body_paid = Decimal(credit.body_paid or 0)
+        percent_paid = Decimal(credit.percent_paid or 0)
+
+        if credit.actual_return_date:
+            total_paid = body_paid + percent_paid
+            return CreditClosedInfo(
+                issuance_date=credit.issuance_date,
+                is_closed=True,
+                actual_return_date=credit.actual_return_date,
+                body=credit.body,
+                percent=credit.percent,
+                total_payments=total_paid,
             )
-            .outerjoin(Payment, Payment.credit_id == Credit.id)
-            .where(Credit.user_id == user_id)
-            .group_by(Credit.id)
-        )
 
-        items: list[CreditClosedInfo | CreditOpenInfo] = []
-
-        for credit, body_paid, percent_paid in result.all():
-            body_paid = Decimal(body_paid or 0)
-            percent_paid = Decimal(percent_paid or 0)
-
-            if credit.actual_return_date:
-                total_paid = body_paid + percent_paid
-                items.append(
-                    CreditClosedInfo(
-                        issuance_date=credit.issuance_date,
-                        is_closed=True,
-                        actual_return_date=credit.actual_return_date,
-                        body=credit.body,
-                        percent=credit.percent,
-                        total_payments=total_paid,
-                    )
-                )
-            else:
-                today = date.today()
-                overdue = max((today - credit.return_date).days, 0)
-                items.append(
-                    CreditOpenInfo(
-                        issuance_date=credit.issuance_date,
-                        is_closed=False,
-                        return_date=credit.return_date,
-                        overdue_days=overdue,
-                        body=credit.body,
-                        percent=credit.percent,
-                        body_payments=body_paid,
-                        percent_payments=percent_paid,
-                    )
-                )
-
-        return UserCreditsResponse(credits=items)
+        overdue = max((today - credit.return_date).days, 0)
+        return CreditOpenInfo(
+            issuance_date=credit.issuance_date,
+            is_closed=False,
+            return_date=credit.return_date,
+            overdue_days=overdue,
+            body=credit.body,
+            percent=credit.percent,
+            body_payments=body_paid,
+            percent_payments=percent_paid,
+        )
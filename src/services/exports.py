@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import asyncio
+import csv
+import io
+import tempfile
+from datetime import date
+from typing import AsyncIterator, Iterable, Literal, NamedTuple
+
+from openpyxl import Workbook
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.config import get_settings
+from src.models.credit import Credit
+from src.models.payment import Payment
+from src.schemas.responses import YearPerformanceItem
+from src.services.categories import category_registry
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional: pip install pyarrow
+    pa = pq = None
+
+ExportFormat = Literal["csv", "xlsx", "parquet"]
+
+MEDIA_TYPES: dict[str, str] = {
+    "csv": "text/csv; charset=utf-8",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+# bytes per chunk when streaming a finished XLSX file
+FILE_CHUNK_SIZE = 64 * 1024
+
+Rows = list[tuple]
+
+
+class ExportColumn(NamedTuple):
+    name: str
+    kind: Literal["int", "str", "date", "decimal", "float"]
+
+
+CREDIT_COLUMNS = (
+    ExportColumn("id", "int"),
+    ExportColumn("user_id", "int"),
+    ExportColumn("issuance_date", "date"),
+    ExportColumn("return_date", "date"),
+    ExportColumn("actual_return_date", "date"),
+    ExportColumn("body", "decimal"),
+    ExportColumn("percent", "decimal"),
+    ExportColumn("body_paid", "decimal"),
+    ExportColumn("percent_paid", "decimal"),
+    ExportColumn("last_payment_date", "date"),
+)
+
+PAYMENT_COLUMNS = (
+    ExportColumn("id", "int"),
+    ExportColumn("credit_id", "int"),
+    ExportColumn("payment_date", "date"),
+    ExportColumn("type_id", "int"),
+    ExportColumn("category", "str"),
+    ExportColumn("sum", "decimal"),
+)
+
+YEAR_PERFORMANCE_COLUMNS = tuple(
+    ExportColumn(name, {int: "int", float: "float"}.get(field.annotation, "decimal"))
+    for name, field in YearPerformanceItem.model_fields.items()
+)
+
+
+def export_available(export_format: ExportFormat) -> bool:
+    return export_format != "parquet" or pq is not None
+
+
+class ExportService:
+    """
+    Reads credit and payment registers for /export from a server-side cursor, export_batch_size
+    rows per round trip, so memory does not grow with the number of rows. Rows are plain tuples
+    in the order of the matching *_COLUMNS.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.batch_size = get_settings().export_batch_size
+
+    async def credit_batches(self, date_from: date | None, date_to: date | None) -> AsyncIterator[Rows]:
+        """Credits issued in [date_from, date_to], by id."""
+        stmt = select(*(getattr(Credit, column.name) for column in CREDIT_COLUMNS)).order_by(Credit.id)
+        stmt = self._between(stmt, Credit.issuance_date, date_from, date_to)
+        async for rows in self._batches(stmt):
+            yield rows
+
+    async def payment_batches(
+        self, date_from: date | None, date_to: date | None, type_id: int | None
+    ) -> AsyncIterator[Rows]:
+        """Payments made in [date_from, date_to], optionally of one category, by id."""
+        columns = (Payment.id, Payment.credit_id, Payment.payment_date, Payment.type_id, Payment.sum)
+        stmt = select(*columns).order_by(Payment.id)
+        stmt = self._between(stmt, Payment.payment_date, date_from, date_to)
+        if type_id is not None:
+            stmt = stmt.where(Payment.type_id == type_id)
+        categories = await category_registry.current(self.session)
+        async for rows in self._batches(stmt):
+            # category names from the registry instead of a join on every row
+            yield [(*row[:4], categories.names.get(row[3]), row[4]) for row in rows]
+
+    @staticmethod
+    def _between(stmt: Select, column, date_from: date | None, date_to: date | None) -> Select:
+        if date_from is not None:
+            stmt = stmt.where(column >= date_from)
+        if date_to is not None:
+            stmt = stmt.where(column <= date_to)
+        return stmt
+
+    async def _batches(self, stmt: Select) -> AsyncIterator[Rows]:
+        result = await self.session.stream(stmt.execution_options(yield_per=self.batch_size))
+        async for rows in result.partitions():
+            yield [tuple(row) for row in rows]
+
+
+async def csv_chunks(columns: Iterable[ExportColumn], batches: AsyncIterator[Rows]) -> AsyncIterator[bytes]:
+    """Header line, then one chunk per batch; dates ISO, decimals as written in the database, NULL as empty."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+
+    def drain() -> bytes:
+        data = buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+        return data
+
+    writer.writerow([column.name for column in columns])
+    yield drain()
+    async for rows in batches:
+        writer.writerows(rows)
+        yield drain()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands out what was written since the last drain()."""
+
+    def __init__(self):
+        super().__init__()
+        self.chunks: list[bytes] = []
+        self.position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def _arrow_schema(columns: Iterable[ExportColumn]):
+    types = {
+        "int": pa.int64(),
+        "str": pa.string(),
+        "date": pa.date32(),
+        # column values are Numeric(12, 2); report sums over many rows get more integer digits
+        "decimal": pa.decimal128(20, 2),
+        "float": pa.float64(),
+    }
+    return pa.schema([(column.name, types[column.kind]) for column in columns])
+
+
+async def parquet_chunks(columns: Iterable[ExportColumn], batches: AsyncIterator[Rows]) -> AsyncIterator[bytes]:
+    """One row group per batch, sent as soon as it is written; the footer comes last."""
+    columns = list(columns)
+    schema = _arrow_schema(columns)
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema)
+    try:
+        async for rows in batches:
+            table = pa.Table.from_arrays(
+                [pa.array(values, type=field.type) for values, field in zip(zip(*rows), schema)], schema=schema
+            )
+            await asyncio.to_thread(writer.write_table, table)
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+async def xlsx_chunks(columns: Iterable[ExportColumn], batches: AsyncIterator[Rows]) -> AsyncIterator[bytes]:
+    """
+    openpyxl's write-only mode keeps rows in a temporary file rather than in memory. The
+    zip container can only be written once all rows are in, so the first byte is sent
+    after the last row is read; the saved file is then streamed in chunks.
+    """
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append([column.name for column in columns])
+
+    def append(rows: Rows) -> None:
+        for row in rows:
+            sheet.append(row)
+
+    async for rows in batches:
+        await asyncio.to_thread(append, rows)
+
+    with tempfile.TemporaryFile() as file:
+        await asyncio.to_thread(workbook.save, file)
+        file.seek(0)
+        while chunk := await asyncio.to_thread(file.read, FILE_CHUNK_SIZE):
+            yield chunk
+
+
+RENDERERS = {"csv": csv_chunks, "xlsx": xlsx_chunks, "parquet": parquet_chunks}
+
+
+def render_export(
+    export_format: ExportFormat, columns: Iterable[ExportColumn], batches: AsyncIterator[Rows]
+) -> AsyncIterator[bytes]:
+    return RENDERERS[export_format](columns, batches)
+
+
+async def single_batch(rows: Rows) -> AsyncIterator[Rows]:
+    yield rows
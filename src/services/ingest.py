@@ -0,0 +1,357 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Literal
+
+import pandas as pd
+from fastapi import HTTPException, Request, status
+from sqlalchemy import insert, select
+from sqlalchemy.exc import DBAPIError, IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.config import get_settings
+from src.models.credit import Credit
+from src.models.idempotency_key import IdempotencyKey
+from src.models.payment import Payment
+from src.models.user import User
+from src.schemas.responses import BulkIngestResponse, IngestBatch
+from src.services.balances import CreditBalancesService
+from src.services.categories import category_registry
+from src.services.plans_import import batches
+from src.services.rollups import RollupsService
+
+IngestKind = Literal["credits", "payments"]
+
+NDJSON = "application/x-ndjson"
+DATE_FORMAT = "%Y-%m-%d"
+LOOKUP_CHUNK = 1000
+# column ranges: ids and references are INT, amounts Numeric(12, 2)
+MAX_INT = 2**31 - 1
+MAX_AMOUNT = 10**10
+
+CREDIT_FIELDS = ("user_id", "issuance_date", "return_date", "body", "percent")
+PAYMENT_FIELDS = ("credit_id", "payment_date", "type_id", "sum")
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+async def read_ingest_body(request: Request) -> bytes:
+    """Read the request body, rejecting it with 413 once it grows past ingest_max_bytes."""
+    max_bytes = get_settings().ingest_max_bytes
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > max_bytes:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Body is larger than {max_bytes} bytes",
+            )
+    return bytes(body)
+
+
+def parse_records(body: bytes, content_type: str | None) -> list[dict]:
+    """A JSON array of objects, or one object per line for application/x-ndjson. Floats are kept as Decimal."""
+    try:
+        if content_type and NDJSON in content_type:
+            records = [json.loads(line, parse_float=Decimal) for line in body.splitlines() if line.strip()]
+        else:
+            records = json.loads(body, parse_float=Decimal)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Body is not valid JSON: {exc}") from exc
+
+    if not isinstance(records, list) or not all(isinstance(record, dict) for record in records):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Body must be a list of JSON objects")
+    if not records:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Body has no rows")
+    max_rows = get_settings().ingest_max_rows
+    if len(records) > max_rows:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"At most {max_rows} rows per request")
+    return records
+
+
+def validate_credits_frame(df: pd.DataFrame) -> tuple[pd.DataFrame, list[dict]]:
+    """
+    Vectorized validation of credit rows. Returns the normalized frame and
+    {"row", "field", "error"} entries, where row is the 1-based position in the body.
+    """
+    df, checks = _normalize(
+        df, CREDIT_FIELDS, ints=("user_id",), dates=("issuance_date", "return_date"), amounts=("body", "percent")
+    )
+    if "actual_return_date" in df.columns:
+        raw = df["actual_return_date"]
+        df["actual_return_date"] = pd.to_datetime(raw, format=DATE_FORMAT, errors="coerce")
+        checks.append(
+            (raw.notna() & df["actual_return_date"].isna(), "actual_return_date", "Invalid date, expected YYYY-MM-DD")
+        )
+        checks.append(
+            (df["actual_return_date"] < df["issuance_date"], "actual_return_date", "Must not be before issuance_date")
+        )
+    checks.append((df["return_date"] < df["issuance_date"], "return_date", "Must not be before issuance_date"))
+    checks.append((df["body"] <= 0, "body", "Must be positive"))
+    checks.append((df["percent"] < 0, "percent", "Must not be negative"))
+    return df, _collect(df, checks)
+
+
+def validate_payments_frame(df: pd.DataFrame) -> tuple[pd.DataFrame, list[dict]]:
+    """Vectorized validation of payment rows; same contract as validate_credits_frame."""
+    df, checks = _normalize(
+        df, PAYMENT_FIELDS, ints=("credit_id", "type_id"), dates=("payment_date",), amounts=("sum",)
+    )
+    checks.append((df["sum"] <= 0, "sum", "Must be positive"))
+    return df, _collect(df, checks)
+
+
+def _normalize(
+    df: pd.DataFrame,
+    fields: tuple[str, ...],
+    ints: tuple[str, ...],
+    dates: tuple[str, ...],
+    amounts: tuple[str, ...],
+) -> tuple[pd.DataFrame, list]:
+    df = df.copy()
+    checks = []
+    for field in fields:
+        if field not in df.columns:
+            df[field] = None
+        checks.append((df[field].isna(), field, "Field is required"))
+
+    for field in (*ints, *(("id",) if "id" in df.columns else ())):
+        raw = df[field]
+        df[field] = pd.to_numeric(raw, errors="coerce")
+        invalid = raw.notna() & (df[field].isna() | (df[field] % 1 != 0) | (df[field] <= 0))
+        checks.append((invalid, field, "Must be a positive integer"))
+        checks.append((df[field] > MAX_INT, field, f"Must be at most {MAX_INT}"))
+    for field in dates:
+        raw = df[field]
+        df[field] = pd.to_datetime(raw, format=DATE_FORMAT, errors="coerce")
+        checks.append((raw.notna() & df[field].isna(), field, "Invalid date, expected YYYY-MM-DD"))
+    for field in amounts:
+        raw = df[field]
+        df[field] = pd.to_numeric(raw, errors="coerce")
+        checks.append((raw.notna() & df[field].isna(), field, "Must be a number"))
+        checks.append((df[field].abs() >= MAX_AMOUNT, field, f"Must be less than {MAX_AMOUNT} in absolute value"))
+        # cents carry ~1e-4 of float error near MAX_AMOUNT; a third decimal shows up as >= 0.1
+        checks.append((df[field].notna() & ((df[field] * 100).round(3) % 1 != 0), field, "At most 2 decimal places"))
+
+    if "id" in df.columns:
+        checks.append((df["id"].isna() & df["id"].notna().any(), "id", "Either every row or no row must have an id"))
+        checks.append((df["id"].notna() & df["id"].duplicated(keep="first"), "id", "Id is duplicated in body"))
+    return df, checks
+
+
+def _collect(df: pd.DataFrame, checks: list) -> list[dict]:
+    row_numbers = df.index + 1
+    errors = [
+        {"row": int(row), "field": field, "error": message}
+        for mask, field, message in checks
+        for row in row_numbers[mask.fillna(False).to_numpy(dtype=bool)]
+    ]
+    errors.sort(key=lambda item: item["row"])
+    return errors
+
+
+def frame_rows(
+    df: pd.DataFrame, columns: tuple[str, ...], dates: tuple[str, ...], amounts: tuple[str, ...]
+) -> list[dict]:
+    """Validated frame -> insert parameter dicts with int / date / Decimal values."""
+    out = pd.DataFrame(index=df.index)
+    for column in columns:
+        if column in dates:
+            out[column] = df[column].dt.date.astype(object).where(df[column].notna(), None)
+        elif column in amounts:
+            out[column] = df[column].map(lambda value: Decimal(f"{value:.2f}"))
+        else:
+            out[column] = df[column].astype("int64").astype(object)
+    return out.to_dict("records")
+
+
+class IngestService:
+    """
+    Bulk credit / payment ingestion. Every request is validated as a whole before anything is
+    written; rows are then inserted ingest_batch_size at a time, one transaction per batch,
+    together with the rollup and balance updates. With an idempotency key each committed batch
+    leaves a marker row in idempotency_keys, so a retried request skips the batches that made it.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def ingest(
+        self, kind: IngestKind, body: bytes, content_type: str | None, idempotency_key: str | None
+    ) -> BulkIngestResponse:
+        started = time.perf_counter()
+        records = parse_records(body, content_type)
+        df = pd.DataFrame.from_records(records)
+        if kind == "credits":
+            df, errors = validate_credits_frame(df)
+        else:
+            df, errors = validate_payments_frame(df)
+        if errors:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={"message": "Invalid rows in body", "errors": errors},
+            )
+
+        rows = self._rows(kind, df)
+        size = get_settings().ingest_batch_size
+        chunks = list(batches(rows, size))
+        payload_hash = hashlib.sha256(body).hexdigest()
+        committed = await self._committed_chunks(kind, idempotency_key, payload_hash)
+
+        pending = [row for index, chunk in enumerate(chunks) if index not in committed for row in chunk]
+        errors = await self._reference_errors(kind, pending, rows)
+        if errors:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={"message": "Invalid rows in body", "errors": errors},
+            )
+
+        results: list[IngestBatch] = []
+        for index, chunk in enumerate(chunks):
+            batch_started = time.perf_counter()
+            if index in committed:
+                state = "replayed"
+            else:
+                state = await self._write_chunk(kind, index, chunk, idempotency_key, payload_hash, results)
+            results.append(
+                IngestBatch(
+                    index=index,
+                    rows=len(chunk),
+                    status=state,
+                    elapsed_ms=round((time.perf_counter() - batch_started) * 1000, 2),
+                )
+            )
+
+        return BulkIngestResponse(
+            received=len(rows),
+            inserted=sum(batch.rows for batch in results if batch.status == "inserted"),
+            replayed=sum(batch.rows for batch in results if batch.status == "replayed"),
+            elapsed_ms=round((time.perf_counter() - started) * 1000, 2),
+            batches=results,
+        )
+
+    async def _write_chunk(
+        self,
+        kind: IngestKind,
+        index: int,
+        chunk: list[dict],
+        idempotency_key: str | None,
+        payload_hash: str,
+        done: list[IngestBatch],
+    ) -> str:
+        try:
+            if idempotency_key:
+                # first statement of the transaction: a concurrent retry blocks here on the primary key
+                await self.session.execute(
+                    insert(IdempotencyKey).values(
+                        key=idempotency_key,
+                        endpoint=kind,
+                        chunk=index,
+                        payload_hash=payload_hash,
+                        rows=len(chunk),
+                        created_at=_utcnow(),
+                    )
+                )
+        except IntegrityError:
+            await self.session.rollback()
+            return "replayed"
+
+        try:
+            if kind == "credits":
+                await self.session.execute(insert(Credit), chunk)
+                await RollupsService(self.session).record_credits(chunk)
+            else:
+                await self.session.execute(insert(Payment), chunk)
+                await RollupsService(self.session).record_payments(chunk)
+                await CreditBalancesService(self.session).record_payments(chunk)
+            await self.session.commit()
+        except DBAPIError as exc:
+            # constraint violations and values the column types reject (DataError under strict mode)
+            await self.session.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail={
+                    "message": f"Batch {index} was rejected by the database: {exc.orig}",
+                    "batches": [batch.model_dump() for batch in done],
+                },
+            ) from exc
+        return "inserted"
+
+    async def _committed_chunks(self, kind: IngestKind, idempotency_key: str | None, payload_hash: str) -> set[int]:
+        if not idempotency_key:
+            return set()
+        markers = (
+            await self.session.execute(
+                select(IdempotencyKey.chunk, IdempotencyKey.payload_hash).where(
+                    IdempotencyKey.key == idempotency_key,
+                    IdempotencyKey.endpoint == kind,
+                )
+            )
+        ).all()
+        if any(marker.payload_hash != payload_hash for marker in markers):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Idempotency-Key was already used with a different body",
+            )
+        return {marker.chunk for marker in markers}
+
+    async def _reference_errors(self, kind: IngestKind, pending: list[dict], rows: list[dict]) -> list[dict]:
+        """Rows pointing at users / credits / payment types that don't exist, or reusing an existing id."""
+        row_numbers = {id(row): number for number, row in enumerate(rows, start=1)}
+        if kind == "credits":
+            references = [("user_id", User.id, "User does not exist")]
+            model_id = Credit.id
+        else:
+            references = [("credit_id", Credit.id, "Credit does not exist")]
+            model_id = Payment.id
+
+        errors = []
+        if kind == "payments":
+            payment_types = (await category_registry.current(self.session)).ids("body", "percent")
+            errors.extend(
+                {"row": row_numbers[id(row)], "field": "type_id", "error": "Not a body or percent payment type"}
+                for row in pending
+                if row["type_id"] not in payment_types
+            )
+        for field, column, message in references:
+            missing = {row[field] for row in pending} - await self._existing(column, pending, field)
+            errors.extend(
+                {"row": row_numbers[id(row)], "field": field, "error": message}
+                for row in pending
+                if row[field] in missing
+            )
+        if pending and "id" in pending[0]:
+            taken = await self._existing(model_id, pending, "id")
+            errors.extend(
+                {"row": row_numbers[id(row)], "field": "id", "error": "Id already exists"}
+                for row in pending
+                if row["id"] in taken
+            )
+        errors.sort(key=lambda item: item["row"])
+        return errors
+
+    async def _existing(self, column, rows: list[dict], field: str) -> set[int]:
+        values = sorted({row[field] for row in rows})
+        found: set[int] = set()
+        for chunk in batches(values, LOOKUP_CHUNK):
+            found.update(await self.session.scalars(select(column).where(column.in_(chunk))))
+        return found
+
+    @staticmethod
+    def _rows(kind: IngestKind, df: pd.DataFrame) -> list[dict]:
+        with_id = ("id",) if "id" in df.columns and df["id"].notna().all() else ()
+        if kind == "credits":
+            optional = ("actual_return_date",) if "actual_return_date" in df.columns else ()
+            return frame_rows(
+                df,
+                (*with_id, *CREDIT_FIELDS, *optional),
+                dates=("issuance_date", "return_date", "actual_return_date"),
+                amounts=("body", "percent"),
+            )
+        return frame_rows(df, (*with_id, *PAYMENT_FIELDS), dates=("payment_date",), amounts=("sum",))
@@ -1,19 +1,32 @@
 from __future__ import annotations
 
-from datetime import date
+import time
+from datetime import date, timedelta
+from typing import Awaitable, Callable, TypeVar
 
 from fastapi import UploadFile
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.cache import report_cache, report_ttl
+from src.core.database import on_replica, replica_lag_bound
+from src.core.singleflight import report_flights
 from src.schemas.responses import (
+    PerformanceSeriesResponse,
     PlanInsertResponse,
     PlansPerformanceResponse,
     YearPerformanceResponse,
 )
-from src.services.plans_import import PlansImportService
+from src.services.plans_import import ImportMode, PlansImportService
 from src.services.plans_monthly import PlansMonthlyService
+from src.services.plans_series import PlansSeriesService, ShareScope
 from src.services.plans_year import PlansYearService
 
+T = TypeVar("T")
+
+
+def _month_end(day: date) -> date:
+    return date(day.year + day.month // 12, day.month % 12 + 1, 1) - timedelta(days=1)
+
 
 class PlansService:
     """
@@ -22,18 +35,65 @@ class PlansService:
     - PlansImportService: insert_plans
     - PlansMonthlyService: plans_performance
     - PlansYearService: year_performance
+    - PlansSeriesService: performance_series
+    Report results are cached in report_cache, keyed by endpoint and parameters;
+    writes to plans, credits or payments invalidate it in every worker (invalidate_reports),
+    and a result whose computation overlapped such a commit is returned but not stored.
+    Concurrent cache misses for the same key are coalesced through report_flights. Results
+    read from the replica are not stored while it may still be missing the last
+    invalidating write.
     """
 
     def __init__(self, session: AsyncSession):
+        self._session = session
         self._import = PlansImportService(session)
         self._monthly = PlansMonthlyService(session)
         self._year = PlansYearService(session)
+        self._series = PlansSeriesService(session)
 
-    async def insert_plans(self, file: UploadFile) -> PlanInsertResponse:
-        return await self._import.insert_plans(file)
+    async def insert_plans(self, file: UploadFile, mode: ImportMode = "insert") -> PlanInsertResponse:
+        return await self._import.insert_plans(file, mode)
 
     async def plans_performance(self, report_date: date) -> PlansPerformanceResponse:
-        return await self._monthly.plans_performance(report_date)
+        return await self._cached(
+            ("plans_performance", report_date),
+            report_ttl(_month_end(report_date)),
+            lambda: self._monthly.plans_performance(report_date),
+        )
 
     async def year_performance(self, year: int) -> YearPerformanceResponse:
-        return await self._year.year_performance(year)
+        return await self._cached(
+            ("year_performance", year),
+            report_ttl(date(year, 12, 31)),
+            lambda: self._year.year_performance(year),
+        )
+
+    async def performance_series(self, start: date, end: date, share_scope: ShareScope) -> PerformanceSeriesResponse:
+        return await self._cached(
+            ("performance_series", start, end, share_scope),
+            report_ttl(_month_end(end)),
+            lambda: self._series.performance_series(start, end, share_scope),
+        )
+
+    async def _cached(self, key: tuple, ttl: float, compute: Callable[[], Awaitable[T]]) -> T:
+        found, value = report_cache.get(key)
+        if found:
+            return value
+
+        async def compute_and_store() -> T:
+            generation = report_cache.generation
+            result = await compute()
+            # a write that committed meanwhile cleared the cache; this result may predate it
+            if report_cache.generation == generation and self._replica_caught_up():
+                report_cache.set(key, result, ttl)
+            return result
+
+        # concurrent misses for the same key share one computation (and one DB connection)
+        return await report_flights.do(key, compute_and_store)
+
+    def _replica_caught_up(self) -> bool:
+        """False while a replica read may not include the write behind the last cache clear."""
+        if not on_replica(self._session) or report_cache.cleared_at is None:
+            return True
+        lag_bound = replica_lag_bound()
+        return lag_bound is not None and time.monotonic() - report_cache.cleared_at >= lag_bound
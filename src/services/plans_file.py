@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+
+import pandas as pd
+from fastapi import HTTPException, UploadFile, status
+from openpyxl import load_workbook
+
+from src.core.config import get_settings
+
+REQUIRED_COLUMNS = ("period", "category", "sum")
+CSV_SUFFIXES = {".csv", ".txt"}
+
+
+class PlansFileError(ValueError):
+    """The file can't be read as a plans table at all (as opposed to individual bad rows)."""
+
+
+async def spool_upload(file: UploadFile) -> Path:
+    """
+    Copy the upload to a temporary file in fixed-size chunks so the request never holds
+    the whole file in memory. Rejects uploads over plans_upload_max_bytes with 413.
+    """
+    settings = get_settings()
+    suffix = Path(file.filename or "").suffix.lower() or ".xlsx"
+    written = 0
+
+    with tempfile.NamedTemporaryFile(prefix="plans-", suffix=suffix, delete=False) as spool:
+        path = Path(spool.name)
+        try:
+            while chunk := await file.read(settings.plans_upload_chunk_size):
+                written += len(chunk)
+                if written > settings.plans_upload_max_bytes:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=f"File is larger than {settings.plans_upload_max_bytes} bytes",
+                    )
+                spool.write(chunk)
+        except BaseException:
+            spool.close()
+            path.unlink(missing_ok=True)
+            raise
+
+    return path
+
+
+@lru_cache
+def _parse_pool() -> ProcessPoolExecutor:
+    # spawn: forking a process that runs an event loop and thread pools is not safe
+    return ProcessPoolExecutor(
+        max_workers=get_settings().plans_parse_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+
+def shutdown_parse_pool() -> None:
+    """Stop the parse processes, if any were started; called on application shutdown."""
+    if _parse_pool.cache_info().currsize:
+        _parse_pool().shutdown(cancel_futures=True)
+        _parse_pool.cache_clear()
+
+
+async def load_plans_file(path: Path) -> tuple[pd.DataFrame, list[dict]]:
+    """Parse and validate a spooled file in the parse process pool, off the event loop."""
+    loop = asyncio.get_running_loop()
+    max_rows = get_settings().plans_upload_max_rows
+    return await loop.run_in_executor(_parse_pool(), parse_and_validate, os.fspath(path), max_rows)
+
+
+def parse_and_validate(path: str, max_rows: int) -> tuple[pd.DataFrame, list[dict]]:
+    df = read_plans_file(Path(path), max_rows)
+    return validate_plans_frame(df)
+
+
+def read_plans_file(path: Path, max_rows: int) -> pd.DataFrame:
+    """Read XLSX with openpyxl read_only streaming, or CSV in chunks; at most max_rows data rows."""
+    if path.suffix in CSV_SUFFIXES:
+        frames = []
+        total = 0
+        try:
+            for chunk in pd.read_csv(path, chunksize=10_000):
+                total += len(chunk)
+                if total > max_rows:
+                    raise PlansFileError(f"File has more than {max_rows} rows")
+                chunk.columns = chunk.columns.str.strip()
+                frames.append(chunk)
+        except (pd.errors.ParserError, pd.errors.EmptyDataError, UnicodeDecodeError) as exc:
+            raise PlansFileError("File is not a valid CSV file") from exc
+        df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    else:
+        try:
+            workbook = load_workbook(path, read_only=True, data_only=True)
+        except Exception as exc:
+            raise PlansFileError("File is not a valid XLSX workbook") from exc
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = next(rows, ())
+            data = []
+            for row in rows:
+                if all(value is None for value in row):
+                    continue
+                if len(data) >= max_rows:
+                    raise PlansFileError(f"File has more than {max_rows} rows")
+                data.append(row)
+        finally:
+            workbook.close()
+        df = pd.DataFrame(data, columns=[str(name).strip() if name is not None else "" for name in header])
+
+    if not set(REQUIRED_COLUMNS).issubset(df.columns):
+        raise PlansFileError("Invalid columns in file")
+    return df[list(REQUIRED_COLUMNS)]
+
+
+def validate_plans_frame(df: pd.DataFrame) -> tuple[pd.DataFrame, list[dict]]:
+    """
+    Vectorized validation of every row. Returns the normalized frame
+    (period as Timestamp, category stripped, sum numeric) and a list of
+    {"row", "field", "error"} entries, where row is the spreadsheet row number.
+    """
+    df = df.copy()
+    df["period"] = pd.to_datetime(df["period"], errors="coerce")
+    df["category"] = df["category"].astype("string").str.strip()
+    raw_sum = df["sum"]
+    df["sum"] = pd.to_numeric(raw_sum, errors="coerce")
+
+    # header occupies the first spreadsheet row
+    row_numbers = df.index + 2
+    checks = [
+        (df["period"].isna(), "period", "Invalid period value"),
+        (df["period"].notna() & (df["period"].dt.day != 1), "period", "Period must be first day of month"),
+        (df["category"].isna() | (df["category"] == ""), "category", "Category must not be empty"),
+        (raw_sum.isna(), "sum", "Sum must not be empty"),
+        (raw_sum.notna() & df["sum"].isna(), "sum", "Sum must be a number"),
+    ]
+    keys = df.assign(key=df["category"].str.lower())
+    checks.append(
+        (
+            df["period"].notna() & keys.duplicated(subset=["period", "key"], keep="first"),
+            "category",
+            "Plan for this period and category is duplicated in file",
+        )
+    )
+
+    errors = [
+        {"row": int(row), "field": field, "error": message}
+        for mask, field, message in checks
+        for row in row_numbers[mask.fillna(True).to_numpy()]
+    ]
+    errors.sort(key=lambda item: item["row"])
+    return df, errors
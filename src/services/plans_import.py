@@ -1,68 +1,139 @@
 from __future__ import annotations
 
+from datetime import date
 from decimal import Decimal
-from io import BytesIO
+from typing import Literal
 
 import pandas as pd
 from fastapi import HTTPException, UploadFile, status
-from sqlalchemy import and_, func, select
+from sqlalchemy import insert, select, tuple_
+from sqlalchemy.dialects.mysql import insert as mysql_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.models.dictionary import Dictionary
 from src.models.plan import Plan
 from src.schemas.responses import PlanInsertResponse
+from src.services.categories import category_registry
+from src.services.plans_file import PlansFileError, load_plans_file, spool_upload
+from src.services.report_versions import invalidate_reports
 
+ImportMode = Literal["insert", "upsert"]
 
-class PlansImportService:
-    def __init__(self, session: AsyncSession):
-        self.session = session
-
-    async def insert_plans(self, file: UploadFile) -> PlanInsertResponse:
-        content = await file.read()
-
-        df = pd.read_excel(BytesIO(content))
-        required_columns = {"period", "category", "sum"}
+# Rows per multi-row statement; import cost grows with the number of batches.
+BATCH_SIZE = 1000
 
-        if not required_columns.issubset(df.columns):
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid columns in file")
 
-        df["period"] = pd.to_datetime(df["period"], errors="coerce")
-        if df["period"].isna().any():
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid period values")
+def batches(items: list, size: int = BATCH_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
 
-        if not all(dt.day == 1 for dt in df["period"]):
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Period must be first day of month")
 
-        if df["sum"].isna().any():
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Sum must not be empty")
+class PlansImportService:
+    def __init__(self, session: AsyncSession):
+        self.session = session
 
-        inserted = 0
+    async def insert_plans(self, file: UploadFile, mode: ImportMode = "insert") -> PlanInsertResponse:
+        """
+        The upload is spooled to disk and parsed/validated in the parse process pool; every
+        invalid row is reported at once.
+        Set-based import: one lookup for categories, one multi-row insert for missing ones,
+        one conflict check and one executemany per batch of plans.
+        mode="insert" rejects the whole file on any existing (period, category);
+        mode="upsert" overwrites their sums via ON DUPLICATE KEY UPDATE.
+        """
+        path = await spool_upload(file)
+        try:
+            df, errors = await load_plans_file(path)
+        except PlansFileError as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+        finally:
+            path.unlink(missing_ok=True)
+
+        if errors:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={"message": "Invalid rows in file", "errors": errors},
+            )
 
-        for _, row in df.iterrows():
-            period = row["period"].date()
-            category_name = str(row["category"]).strip()
-            amount = Decimal(str(row["sum"]))
+        category_ids = await self.resolve_categories(df["category"].unique().tolist())
 
-            category = await self.session.scalar(select(Dictionary).where(Dictionary.name == category_name))
+        rows = self.plan_rows(df, category_ids)
+        plan_batches = list(batches(rows))
 
-            if not category:
-                category = Dictionary(name=category_name)
-                self.session.add(category)
-                await self.session.flush()
+        existing: set[tuple[date, int]] = set()
+        for batch in plan_batches:
+            existing |= await self.existing_keys(batch)
 
-            exists = await self.session.scalar(
-                select(func.count()).where(and_(Plan.period == period, Plan.category_id == category.id))
+        if existing and mode == "insert":
+            period, category_id = min(existing)
+            category_name = next(name for name, cid in category_ids.items() if cid == category_id)
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Plan for {period} and {category_name} already exists",
             )
 
-            if exists:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Plan for {period} and {category_name} already exists",
-                )
-
-            plan = Plan(period=period, sum=amount, category_id=category.id)
-            self.session.add(plan)
-            inserted += 1
+        for batch in plan_batches:
+            await self.write_batch(batch, mode)
 
+        updated = len(existing)
+        inserted = len(rows) - updated
+        await invalidate_reports(self.session)
         await self.session.commit()
-        return PlanInsertResponse(inserted=inserted, message="Plans inserted")
+        message = "Plans upserted" if mode == "upsert" else "Plans inserted"
+        return PlanInsertResponse(inserted=inserted, updated=updated, message=message)
+
+    async def resolve_categories(self, names: list[str]) -> dict[str, int]:
+        """
+        Map category names to ids, creating the missing ones with a single multi-row insert.
+        Names are matched case-insensitively, like the dictionary.name collation does. Known
+        names come from the category registry; only unknown ones are looked up.
+        """
+        categories = await category_registry.current(self.session)
+        found: dict[str, int] = {
+            name.lower(): categories.id_for_name(name) for name in names if categories.id_for_name(name) is not None
+        }
+
+        async def lookup(batch: list[str]) -> None:
+            rows = await self.session.execute(select(Dictionary.name, Dictionary.id).where(Dictionary.name.in_(batch)))
+            found.update({name.lower(): category_id for name, category_id in rows})
+
+        # created by another worker since the registry was loaded
+        for batch in batches([name for name in names if name.lower() not in found]):
+            await lookup(batch)
+
+        missing = list({name.lower(): name for name in names if name.lower() not in found}.values())
+        if missing:
+            await self.session.execute(insert(Dictionary), [{"name": name} for name in missing])
+            for batch in batches(missing):
+                await lookup(batch)
+            category_registry.reload_on_commit(self.session)
+
+        return {name: found[name.lower()] for name in names}
+
+    @staticmethod
+    def plan_rows(df: pd.DataFrame, category_ids: dict[str, int]) -> list[dict]:
+        """Validated frame -> insert parameters for Plan."""
+        return [
+            {
+                "period": period.date(),
+                "sum": Decimal(str(amount)),
+                "category_id": category_ids[category_name],
+            }
+            for period, category_name, amount in zip(df["period"], df["category"], df["sum"])
+        ]
+
+    async def write_batch(self, batch: list[dict], mode: ImportMode) -> None:
+        """One multi-row statement per batch: executemany insert, or ON DUPLICATE KEY UPDATE for upsert."""
+        if mode == "upsert":
+            stmt = mysql_insert(Plan).values(batch)
+            await self.session.execute(stmt.on_duplicate_key_update(sum=stmt.inserted.sum))
+        else:
+            await self.session.execute(insert(Plan), batch)
+
+    async def existing_keys(self, batch: list[dict]) -> set[tuple[date, int]]:
+        """(period, category_id) pairs of the batch that already hit uq_plan_period_category."""
+        keys = [(row["period"], row["category_id"]) for row in batch]
+        rows = await self.session.execute(
+            select(Plan.period, Plan.category_id).where(tuple_(Plan.period, Plan.category_id).in_(keys))
+        )
+        return {(period, category_id) for period, category_id in rows}
@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from fastapi import HTTPException, UploadFile, status
+from sqlalchemy import or_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.config import get_settings
+from src.core.database import SessionLocal
+from src.models.plan_import_job import PlanImportJob
+from src.schemas.responses import PlanImportJobResponse
+from src.services.plans_file import PlansFileError, load_plans_file, spool_upload
+from src.services.plans_import import ImportMode, PlansImportService, batches
+from src.services.report_versions import invalidate_reports
+
+logger = logging.getLogger(__name__)
+
+# Errors kept on the job row; the counters still cover every rejected row.
+MAX_STORED_ERRORS = 100
+
+# Per-process cap on running imports; each running import holds one pooled connection.
+_import_slots = asyncio.Semaphore(get_settings().plans_import_max_concurrency)
+
+# Jobs run in the process that accepted them; this id marks them as ours on the job row.
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"[:64]
+ACTIVE_STATUSES = ("queued", "running")
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class PlansImportJobService:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def create_job(self, file: UploadFile, mode: ImportMode) -> tuple[PlanImportJob, Path]:
+        """Spool the upload and register a queued job; the caller schedules run_import_job."""
+        path = await spool_upload(file)
+        job = PlanImportJob(
+            id=str(uuid.uuid4()),
+            status="queued",
+            mode=mode,
+            filename=file.filename,
+            rows_parsed=0,
+            rows_inserted=0,
+            rows_updated=0,
+            rows_rejected=0,
+            created_at=_utcnow(),
+            owner=WORKER_ID,
+            heartbeat_at=_utcnow(),
+        )
+        self.session.add(job)
+        try:
+            await self.session.commit()
+        except BaseException:
+            path.unlink(missing_ok=True)
+            raise
+        return job, path
+
+    async def get_job(self, job_id: str) -> PlanImportJobResponse:
+        job = await self.session.get(PlanImportJob, job_id)
+        if job is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Import job not found")
+        return job_response(job)
+
+
+def job_response(job: PlanImportJob) -> PlanImportJobResponse:
+    if job.started_at is None:
+        elapsed = 0.0
+    else:
+        elapsed = ((job.finished_at or _utcnow()) - job.started_at).total_seconds()
+    return PlanImportJobResponse(
+        id=job.id,
+        status=job.status,
+        mode=job.mode,
+        filename=job.filename,
+        rows_parsed=job.rows_parsed,
+        rows_inserted=job.rows_inserted,
+        rows_updated=job.rows_updated,
+        rows_rejected=job.rows_rejected,
+        elapsed_seconds=round(elapsed, 3),
+        message=job.message,
+        errors=job.errors or [],
+    )
+
+
+async def run_import_job(job_id: str, path: Path, mode: ImportMode) -> None:
+    """
+    Background import: waits for a free import slot, then parses the spooled file and
+    writes plans in batched transactions, committing progress counters after each batch.
+    Invalid rows and (in insert mode) plans that already exist are rejected and skipped
+    instead of failing the whole file.
+    """
+    try:
+        async with _import_slots:
+            async with SessionLocal() as session:
+                job = await session.get(PlanImportJob, job_id)
+                if job is None:
+                    return
+                try:
+                    await _run(session, job, path, mode)
+                except Exception as exc:
+                    logger.exception("Plan import job %s failed", job_id)
+                    await session.rollback()
+                    job = await session.get(PlanImportJob, job_id)
+                    job.status = "failed"
+                    job.message = (str(exc) or exc.__class__.__name__)[:255]
+                    job.finished_at = _utcnow()
+                    await session.commit()
+    finally:
+        path.unlink(missing_ok=True)
+
+
+async def _run(session: AsyncSession, job: PlanImportJob, path: Path, mode: ImportMode) -> None:
+    job.status = "running"
+    job.started_at = _utcnow()
+    await session.commit()
+
+    try:
+        df, errors = await load_plans_file(path)
+    except PlansFileError as exc:
+        job.status = "failed"
+        job.message = str(exc)
+        job.finished_at = _utcnow()
+        await session.commit()
+        return
+
+    rejected_rows = {error["row"] for error in errors}
+    valid = df[~(df.index + 2).isin(rejected_rows)]
+    job.rows_parsed = len(df)
+    job.rows_rejected = len(rejected_rows)
+    job.errors = errors[:MAX_STORED_ERRORS]
+    await session.commit()
+
+    service = PlansImportService(session)
+    category_ids = await service.resolve_categories(valid["category"].unique().tolist())
+    await session.commit()
+
+    names_by_id = {category_id: name for name, category_id in category_ids.items()}
+    rows = service.plan_rows(valid, category_ids)
+    for batch in batches(rows):
+        existing = await service.existing_keys(batch)
+        if mode == "insert" and existing:
+            batch = [row for row in batch if (row["period"], row["category_id"]) not in existing]
+            job.rows_rejected += len(existing)
+            job.errors = _with_errors(
+                job.errors,
+                [
+                    {"row": None, "field": "category", "error": f"Plan for {period} and {names_by_id[category_id]} already exists"}
+                    for period, category_id in sorted(existing)
+                ],
+            )
+        elif mode == "upsert":
+            job.rows_updated += len(existing)
+
+        if batch:
+            await service.write_batch(batch, mode)
+            await invalidate_reports(session)
+        job.rows_inserted += len(batch) - (len(existing) if mode == "upsert" else 0)
+        await session.commit()
+
+    job.status = "completed"
+    job.message = "Plans upserted" if mode == "upsert" else "Plans inserted"
+    job.finished_at = _utcnow()
+    await session.commit()
+
+
+def _with_errors(current: list | None, new: list[dict]) -> list[dict]:
+    # reassign rather than mutate so the JSON column is marked dirty
+    return ((current or []) + new)[:MAX_STORED_ERRORS]
+
+
+class ImportJobHeartbeat:
+    """
+    Jobs run in the worker that accepted them, so a crash or restart would leave them queued
+    or running forever. Every interval seconds this refreshes heartbeat_at of the worker's
+    own queued and running jobs and fails any job (of any worker) whose heartbeat is older
+    than stale_after. On shutdown the worker fails its own unfinished jobs right away.
+    """
+
+    def __init__(self, interval: float, stale_after: float):
+        self.interval = interval
+        self.stale_after = stale_after
+        self._task: asyncio.Task | None = None
+
+    async def beat(self) -> None:
+        now = _utcnow()
+        async with SessionLocal() as session:
+            await session.execute(
+                update(PlanImportJob)
+                .where(PlanImportJob.owner == WORKER_ID, PlanImportJob.status.in_(ACTIVE_STATUSES))
+                .values(heartbeat_at=now)
+            )
+            stale = await session.execute(
+                update(PlanImportJob)
+                .where(
+                    PlanImportJob.status.in_(ACTIVE_STATUSES),
+                    or_(
+                        PlanImportJob.heartbeat_at.is_(None),
+                        PlanImportJob.heartbeat_at < now - timedelta(seconds=self.stale_after),
+                    ),
+                )
+                .values(status="failed", message="Import stopped: the worker running it went away", finished_at=now)
+            )
+            await session.commit()
+        if stale.rowcount:
+            logger.warning("Failed %d plan import jobs whose worker stopped", stale.rowcount)
+
+    async def fail_own(self) -> None:
+        async with SessionLocal() as session:
+            await session.execute(
+                update(PlanImportJob)
+                .where(PlanImportJob.owner == WORKER_ID, PlanImportJob.status.in_(ACTIVE_STATUSES))
+                .values(status="failed", message="Import stopped: the worker shut down", finished_at=_utcnow())
+            )
+            await session.commit()
+
+    async def run(self) -> None:
+        """Background loop started by the app lifespan."""
+        while True:
+            try:
+                await self.beat()
+            except Exception:
+                logger.exception("Plan import job heartbeat failed")
+            await asyncio.sleep(self.interval)
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        try:
+            await self.fail_own()
+        except Exception:
+            logger.exception("Failing this worker's unfinished plan import jobs at shutdown failed")
+
+
+import_job_heartbeat = ImportJobHeartbeat(
+    get_settings().plans_import_heartbeat_interval, get_settings().plans_import_stale_after
+)
@@ -6,11 +6,10 @@ from decimal import Decimal
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.models.credit import Credit
-from src.models.dictionary import Dictionary
-from src.models.payment import Payment
+from src.models.daily_totals import DailyIssuanceTotal, DailyPaymentTotal
 from src.models.plan import Plan
 from src.schemas.responses import PlanPerformanceItem, PlansPerformanceResponse
+from src.services.categories import Categories, category_registry
 
 
 class PlansMonthlyService:
@@ -20,70 +19,57 @@ class PlansMonthlyService:
     async def plans_performance(self, report_date: date) -> PlansPerformanceResponse:
         """
         Returns the execution of plans for a specific month (period = first day of month report_date).
-        Avoids N+1: one query for plans + up to two aggregate queries for facts.
+        Avoids N+1: one query for plans + up to two aggregate queries for facts,
+        both read from the daily rollup tables.
         """
         month_start = date(report_date.year, report_date.month, 1)
 
-        plans_result = await self.session.execute(
-            select(Plan, Dictionary.name)
-            .join(Dictionary, Plan.category_id == Dictionary.id)
-            .where(Plan.period == month_start)
-        )
-        plans = plans_result.all()
+        plans = (await self.session.scalars(select(Plan).where(Plan.period == month_start))).all()
 
         if not plans:
             return PlansPerformanceResponse(items=[])
 
-        issuance_labels = {"видача"}
-        issuance_periods = {plan.period for plan, name in plans if name.lower() in issuance_labels}
-        payment_periods = {plan.period for plan, name in plans if name.lower() not in issuance_labels}
+        categories = await category_registry.covering(self.session, (plan.category_id for plan in plans))
+        issuance_ids = categories.ids("issuance")
+        has_issuance = any(plan.category_id in issuance_ids for plan in plans)
+        has_payments = any(plan.category_id not in issuance_ids for plan in plans)
 
-        issuance_sums: dict[date, Decimal] = {}
-        if issuance_periods:
-            issuance_rows = await self.session.execute(
-                select(
-                    Plan.period,
-                    func.coalesce(func.sum(Credit.body), 0).label("sum_body"),
+        # Every plan here has period == month_start, so facts are sums of at most 31
+        # daily rollup rows, read by primary key range.
+        issuance_sum = Decimal("0")
+        if has_issuance:
+            issuance_sum = Decimal(
+                await self.session.scalar(
+                    select(func.coalesce(func.sum(DailyIssuanceTotal.issuance_sum), 0)).where(
+                        DailyIssuanceTotal.day.between(month_start, report_date)
+                    )
                 )
-                .join(Dictionary, Plan.category_id == Dictionary.id)
-                .join(Credit, Credit.issuance_date.between(Plan.period, report_date))
-                .where(func.lower(Dictionary.name).in_(issuance_labels))
-                .where(Plan.period.in_(issuance_periods))
-                .group_by(Plan.period)
             )
-            issuance_sums = {row.period: Decimal(row.sum_body) for row in issuance_rows}
 
-        payment_sums: dict[date, Decimal] = {}
-        if payment_periods:
-            payment_rows = await self.session.execute(
-                select(
-                    Plan.period,
-                    func.coalesce(func.sum(Payment.sum), 0).label("sum_pay"),
-                )
-                .join(Dictionary, Plan.category_id == Dictionary.id)
-                .join(Payment, Payment.payment_date.between(Plan.period, report_date))
-                .where(~func.lower(Dictionary.name).in_(issuance_labels))
-                .where(Plan.period.in_(payment_periods))
-                .group_by(Plan.period)
-            )
-            payment_sums = {row.period: Decimal(row.sum_pay) for row in payment_rows}
-
-        items: list[PlanPerformanceItem] = []
-        for plan, category_name in plans:
-            if category_name.lower() in issuance_labels:
-                fact_sum = issuance_sums.get(plan.period, Decimal("0"))
-            else:
-                fact_sum = payment_sums.get(plan.period, Decimal("0"))
-
-            completion = float(fact_sum / plan.sum * 100) if plan.sum != 0 else 100.0
-            items.append(
-                PlanPerformanceItem(
-                    period=plan.period,
-                    category=category_name,
-                    plan_sum=plan.sum,
-                    fact_sum=fact_sum,
-                    completion=round(completion, 2),
+        payment_sum = Decimal("0")
+        if has_payments:
+            payment_sum = Decimal(
+                await self.session.scalar(
+                    select(func.coalesce(func.sum(DailyPaymentTotal.payment_sum), 0)).where(
+                        DailyPaymentTotal.day.between(month_start, report_date)
+                    )
                 )
             )
 
+        items = [self.plan_item(plan, categories, issuance_sum, payment_sum) for plan in plans]
         return PlansPerformanceResponse(items=items)
+
+    @staticmethod
+    def plan_item(
+        plan: Plan, categories: Categories, issuance_sum: Decimal, payment_sum: Decimal
+    ) -> PlanPerformanceItem:
+        """Issuance plans are measured against issued bodies, every other category against payments."""
+        fact_sum = issuance_sum if categories.kinds.get(plan.category_id) == "issuance" else payment_sum
+        completion = float(fact_sum / plan.sum * 100) if plan.sum != 0 else 100.0
+        return PlanPerformanceItem(
+            period=plan.period,
+            category=categories.names[plan.category_id],
+            plan_sum=plan.sum,
+            fact_sum=fact_sum,
+            completion=round(completion, 2),
+        )
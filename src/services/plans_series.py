@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Literal
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.plan import Plan
+from src.schemas.responses import PerformanceSeriesResponse
+from src.services.categories import category_registry
+from src.services.plans_monthly import PlansMonthlyService
+from src.services.plans_year import EMPTY_MONTH, PlansYearService
+
+ShareScope = Literal["year", "range"]
+
+
+def month_range(start: date, end: date) -> list[tuple[int, int]]:
+    """(year, month) pairs from start's month to end's month inclusive."""
+    months = []
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        months.append((year, month))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+class PlansSeriesService:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def performance_series(
+        self, start: date, end: date, share_scope: ShareScope = "year"
+    ) -> PerformanceSeriesResponse:
+        """
+        Monthly plan-vs-fact rows for every month between start and end (first days of months).
+        Two round trips for any range: one grouped UNION ALL for the month totals and one
+        for the plans. share_scope="year" gives the same month shares as /year_performance;
+        "range" computes shares over the whole requested range.
+        """
+        months = month_range(start, end)
+        last_day = date(end.year + end.month // 12, end.month % 12 + 1, 1) - timedelta(days=1)
+
+        # per-year shares need full-year totals even when the range starts or ends mid-year
+        totals_start = date(start.year, 1, 1) if share_scope == "year" else start
+        totals_end = date(end.year, 12, 31) if share_scope == "year" else last_day
+        by_month = await PlansYearService(self.session).monthly_totals(totals_start, totals_end)
+
+        issuance_totals: dict[int | None, Decimal] = defaultdict(Decimal)
+        payment_totals: dict[int | None, Decimal] = defaultdict(Decimal)
+        for (year, month), totals in by_month.items():
+            scope = year if share_scope == "year" else None
+            issuance_totals[scope] += totals["issuance_sum"]
+            payment_totals[scope] += totals["payment_sum"]
+
+        month_items = []
+        for year, month in months:
+            scope = year if share_scope == "year" else None
+            month_items.append(
+                PlansYearService.month_item(
+                    year,
+                    month,
+                    by_month.get((year, month), EMPTY_MONTH),
+                    issuance_totals[scope],
+                    payment_totals[scope],
+                )
+            )
+
+        plans = (
+            await self.session.scalars(
+                select(Plan).where(Plan.period.between(start, end)).order_by(Plan.period, Plan.id)
+            )
+        ).all()
+        categories = await category_registry.covering(self.session, (plan.category_id for plan in plans))
+        plan_items = []
+        for plan in plans:
+            totals = by_month.get((plan.period.year, plan.period.month), EMPTY_MONTH)
+            plan_items.append(
+                PlansMonthlyService.plan_item(plan, categories, totals["issuance_sum"], totals["payment_sum"])
+            )
+
+        return PerformanceSeriesResponse(months=month_items, plans=plan_items)
@@ -3,14 +3,22 @@ from __future__ import annotations
 from datetime import date
 from decimal import Decimal
 
-from sqlalchemy import func, select
+from sqlalchemy import case, func, literal, select, union_all
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.models.credit import Credit
-from src.models.dictionary import Dictionary
-from src.models.payment import Payment
+from src.models.daily_totals import DailyIssuanceTotal, DailyPaymentTotal
 from src.models.plan import Plan
 from src.schemas.responses import YearPerformanceItem, YearPerformanceResponse
+from src.services.categories import category_registry
+
+EMPTY_MONTH = {
+    "issuance_sum": Decimal("0"),
+    "issuance_count": 0,
+    "payment_sum": Decimal("0"),
+    "payment_count": 0,
+    "issuance_plan_sum": Decimal("0"),
+    "payment_plan_sum": Decimal("0"),
+}
 
 
 class PlansYearService:
@@ -18,99 +26,115 @@ class PlansYearService:
         self.session = session
 
     async def year_performance(self, year: int) -> YearPerformanceResponse:
-        year_start = date(year, 1, 1)
-        year_end = date(year, 12, 31)
-
-        issuance_labels = {"видача"}
-
-        issuance_total = Decimal(
-            await self.session.scalar(
-                select(func.coalesce(func.sum(Credit.body), 0)).where(Credit.issuance_date.between(year_start, year_end))
-            )
-        )
-        payment_total = Decimal(
-            await self.session.scalar(
-                select(func.coalesce(func.sum(Payment.sum), 0)).where(Payment.payment_date.between(year_start, year_end))
-            )
-        )
-
-        issuance_rows = await self.session.execute(
-            select(
-                func.year(Credit.issuance_date).label("y"),
-                func.month(Credit.issuance_date).label("m"),
-                func.coalesce(func.sum(Credit.body), 0).label("sum_body"),
-                func.count().label("cnt"),
-            )
-            .where(Credit.issuance_date.between(year_start, year_end))
-            .group_by("y", "m")
-        )
-        issuance_by_month = {(int(r.y), int(r.m)): (Decimal(r.sum_body), int(r.cnt)) for r in issuance_rows}
+        """
+        One round trip: issuance and payment rollups plus plan sums are combined with
+        UNION ALL and grouped per month; yearly totals are the sums of the monthly rows.
+        """
+        by_month = await self.monthly_totals(date(year, 1, 1), date(year, 12, 31))
+
+        issuance_total = sum((row["issuance_sum"] for row in by_month.values()), Decimal("0"))
+        payment_total = sum((row["payment_sum"] for row in by_month.values()), Decimal("0"))
+
+        items = [
+            self.month_item(year, month, by_month.get((year, month), EMPTY_MONTH), issuance_total, payment_total)
+            for month in range(1, 13)
+        ]
+        return YearPerformanceResponse(items=items)
 
-        payment_rows = await self.session.execute(
-            select(
-                func.year(Payment.payment_date).label("y"),
-                func.month(Payment.payment_date).label("m"),
-                func.coalesce(func.sum(Payment.sum), 0).label("sum_pay"),
-                func.count().label("cnt"),
-            )
-            .where(Payment.payment_date.between(year_start, year_end))
-            .group_by("y", "m")
+    @staticmethod
+    def month_item(
+        year: int, month: int, totals: dict, issuance_total: Decimal, payment_total: Decimal
+    ) -> YearPerformanceItem:
+        """Plan completion for the month; shares are relative to the given issuance/payment totals."""
+        issuance_sum, payment_sum = totals["issuance_sum"], totals["payment_sum"]
+        issuance_plan_sum, payment_plan_sum = totals["issuance_plan_sum"], totals["payment_plan_sum"]
+
+        issuance_completion = float(issuance_sum / issuance_plan_sum * 100) if issuance_plan_sum != 0 else 100.0
+        payment_completion = float(payment_sum / payment_plan_sum * 100) if payment_plan_sum != 0 else 100.0
+
+        issuance_share = float(issuance_sum / issuance_total * 100) if issuance_total != 0 else 0.0
+        payment_share = float(payment_sum / payment_total * 100) if payment_total != 0 else 0.0
+
+        return YearPerformanceItem(
+            month=month,
+            year=year,
+            issuance_count=totals["issuance_count"],
+            issuance_plan_sum=issuance_plan_sum,
+            issuance_sum=issuance_sum,
+            issuance_completion=round(issuance_completion, 2),
+            payment_count=totals["payment_count"],
+            payment_plan_sum=payment_plan_sum,
+            payment_sum=payment_sum,
+            payment_completion=round(payment_completion, 2),
+            issuance_month_share=round(issuance_share, 2),
+            payment_month_share=round(payment_share, 2),
         )
-        payment_by_month = {(int(r.y), int(r.m)): (Decimal(r.sum_pay), int(r.cnt)) for r in payment_rows}
 
-        issuance_plan_rows = await self.session.execute(
+    async def monthly_totals(self, start: date, end: date) -> dict[tuple[int, int], dict]:
+        """(year, month) -> fact and plan totals for every month in [start, end] that has data."""
+        zero = literal(0)
+
+        issuance = select(
+            func.year(DailyIssuanceTotal.day).label("y"),
+            func.month(DailyIssuanceTotal.day).label("m"),
+            func.sum(DailyIssuanceTotal.issuance_sum).label("issuance_sum"),
+            func.sum(DailyIssuanceTotal.issuance_count).label("issuance_count"),
+            zero.label("payment_sum"),
+            zero.label("payment_count"),
+            zero.label("issuance_plan_sum"),
+            zero.label("payment_plan_sum"),
+        ).where(DailyIssuanceTotal.day.between(start, end)).group_by("y", "m")
+
+        payments = select(
+            func.year(DailyPaymentTotal.day).label("y"),
+            func.month(DailyPaymentTotal.day).label("m"),
+            zero,
+            zero,
+            func.sum(DailyPaymentTotal.payment_sum),
+            func.sum(DailyPaymentTotal.payment_count),
+            zero,
+            zero,
+        ).where(DailyPaymentTotal.day.between(start, end)).group_by("y", "m")
+
+        categories = await category_registry.current(self.session)
+        is_issuance_plan = Plan.category_id.in_(sorted(categories.ids("issuance")))
+        plans = (
             select(
                 func.year(Plan.period).label("y"),
                 func.month(Plan.period).label("m"),
-                func.coalesce(func.sum(Plan.sum), 0).label("sum_plan"),
+                zero,
+                zero,
+                zero,
+                zero,
+                func.sum(case((is_issuance_plan, Plan.sum), else_=0)),
+                func.sum(case((is_issuance_plan, 0), else_=Plan.sum)),
             )
-            .join(Dictionary, Plan.category_id == Dictionary.id)
-            .where(func.lower(Dictionary.name).in_(issuance_labels), Plan.period.between(year_start, year_end))
+            .where(Plan.period.between(start, end))
             .group_by("y", "m")
         )
-        issuance_plan_by_month = {(int(r.y), int(r.m)): Decimal(r.sum_plan) for r in issuance_plan_rows}
 
-        payment_plan_rows = await self.session.execute(
+        combined = union_all(issuance, payments, plans).subquery()
+        rows = await self.session.execute(
             select(
-                func.year(Plan.period).label("y"),
-                func.month(Plan.period).label("m"),
-                func.coalesce(func.sum(Plan.sum), 0).label("sum_plan"),
-            )
-            .join(Dictionary, Plan.category_id == Dictionary.id)
-            .where(~func.lower(Dictionary.name).in_(issuance_labels), Plan.period.between(year_start, year_end))
-            .group_by("y", "m")
+                combined.c.y,
+                combined.c.m,
+                func.sum(combined.c.issuance_sum).label("issuance_sum"),
+                func.sum(combined.c.issuance_count).label("issuance_count"),
+                func.sum(combined.c.payment_sum).label("payment_sum"),
+                func.sum(combined.c.payment_count).label("payment_count"),
+                func.sum(combined.c.issuance_plan_sum).label("issuance_plan_sum"),
+                func.sum(combined.c.payment_plan_sum).label("payment_plan_sum"),
+            ).group_by(combined.c.y, combined.c.m)
         )
-        payment_plan_by_month = {(int(r.y), int(r.m)): Decimal(r.sum_plan) for r in payment_plan_rows}
-
-        items: list[YearPerformanceItem] = []
-        for month in range(1, 13):
-            key = (year, month)
-            issuance_sum, issuance_count = issuance_by_month.get(key, (Decimal("0"), 0))
-            payment_sum, payment_count = payment_by_month.get(key, (Decimal("0"), 0))
-            issuance_plan_sum = issuance_plan_by_month.get(key, Decimal("0"))
-            payment_plan_sum = payment_plan_by_month.get(key, Decimal("0"))
-
-            issuance_completion = float(issuance_sum / issuance_plan_sum * 100) if issuance_plan_sum != 0 else 100.0
-            payment_completion = float(payment_sum / payment_plan_sum * 100) if payment_plan_sum != 0 else 100.0
-
-            issuance_share = float(issuance_sum / issuance_total * 100) if issuance_total != 0 else 0.0
-            payment_share = float(payment_sum / payment_total * 100) if payment_total != 0 else 0.0
-
-            items.append(
-                YearPerformanceItem(
-                    month=month,
-                    year=year,
-                    issuance_count=issuance_count,
-                    issuance_plan_sum=issuance_plan_sum,
-                    issuance_sum=issuance_sum,
-                    issuance_completion=round(issuance_completion, 2),
-                    payment_count=payment_count,
-                    payment_plan_sum=payment_plan_sum,
-                    payment_sum=payment_sum,
-                    payment_completion=round(payment_completion, 2),
-                    issuance_month_share=round(issuance_share, 2),
-                    payment_month_share=round(payment_share, 2),
-                )
-            )
 
-        return YearPerformanceResponse(items=items)
+        return {
+            (int(r.y), int(r.m)): {
+                "issuance_sum": Decimal(r.issuance_sum or 0),
+                "issuance_count": int(r.issuance_count or 0),
+                "payment_sum": Decimal(r.payment_sum or 0),
+                "payment_count": int(r.payment_count or 0),
+                "issuance_plan_sum": Decimal(r.issuance_plan_sum or 0),
+                "payment_plan_sum": Decimal(r.payment_plan_sum or 0),
+            }
+            for r in rows
+        }
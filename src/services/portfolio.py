@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Literal
+
+from sqlalchemy import case, func, literal, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.credit import Credit
+from src.models.payment import Payment
+from src.schemas.responses import AgingBucket, AgingGroup, PortfolioAgingResponse
+from src.services.categories import category_registry
+
+AgingGroupBy = Literal["issuance_month"]
+
+# (label, most days overdue); the last bucket is open-ended
+AGING_BUCKETS = (("current", 0), ("1-30", 30), ("31-60", 60), ("61-90", 90), ("90+", None))
+
+
+class PortfolioService:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def aging(self, as_of: date, group_by: AgingGroupBy | None = None) -> PortfolioAgingResponse:
+        """
+        Credits open on as_of (issued by then, not yet returned) by days overdue, with the body
+        and percent still owed. One aggregate over credits: amounts paid come from the
+        denormalized body_paid/percent_paid columns, minus payments dated after as_of, which
+        for today is an empty range of ix_payments_date_sum. Buckets compare return_date with
+        precomputed dates, so no per-row date arithmetic.
+        """
+        categories = await category_registry.current(self.session)
+        body_type_id, percent_type_id = categories.id_for("body"), categories.id_for("percent")
+
+        later = (
+            select(
+                Payment.credit_id,
+                func.sum(case((Payment.type_id == body_type_id, Payment.sum), else_=0)).label("body"),
+                func.sum(case((Payment.type_id == percent_type_id, Payment.sum), else_=0)).label("percent"),
+            )
+            .where(Payment.payment_date > as_of)
+            .group_by(Payment.credit_id)
+            .subquery()
+        )
+        body_paid = Credit.body_paid - func.coalesce(later.c.body, 0)
+        percent_paid = Credit.percent_paid - func.coalesce(later.c.percent, 0)
+
+        bucket = case(
+            *(
+                (Credit.return_date >= as_of - timedelta(days=days), literal(label))
+                for label, days in AGING_BUCKETS
+                if days is not None
+            ),
+            else_=literal(AGING_BUCKETS[-1][0]),
+        ).label("bucket")
+        keys = [bucket]
+        if group_by == "issuance_month":
+            keys = [func.year(Credit.issuance_date).label("y"), func.month(Credit.issuance_date).label("m"), bucket]
+
+        rows = await self.session.execute(
+            select(
+                *keys,
+                func.count().label("credits"),
+                func.sum(func.greatest(Credit.body - body_paid, 0)).label("outstanding_body"),
+                func.sum(func.greatest(Credit.percent - percent_paid, 0)).label("outstanding_percent"),
+            )
+            .outerjoin(later, later.c.credit_id == Credit.id)
+            .where(
+                Credit.issuance_date <= as_of,
+                or_(Credit.actual_return_date.is_(None), Credit.actual_return_date > as_of),
+            )
+            .group_by(*(key.name for key in keys))
+        )
+
+        totals: dict[str, list] = {}
+        groups: dict[date, dict[str, list]] = {}
+        for row in rows:
+            figures = [int(row.credits), Decimal(row.outstanding_body or 0), Decimal(row.outstanding_percent or 0)]
+            self._add(totals, row.bucket, figures)
+            if group_by == "issuance_month":
+                self._add(groups.setdefault(date(int(row.y), int(row.m), 1), {}), row.bucket, figures)
+
+        return PortfolioAgingResponse(
+            as_of=as_of,
+            buckets=self._buckets(totals),
+            groups=(
+                [AgingGroup(issuance_month=month, buckets=self._buckets(groups[month])) for month in sorted(groups)]
+                if group_by is not None
+                else None
+            ),
+        )
+
+    @staticmethod
+    def _add(buckets: dict[str, list], label: str, figures: list) -> None:
+        current = buckets.setdefault(label, [0, Decimal("0"), Decimal("0")])
+        for index, value in enumerate(figures):
+            current[index] += value
+
+    @staticmethod
+    def _buckets(figures: dict[str, list]) -> list[AgingBucket]:
+        """Every bucket in order, empty ones included."""
+        buckets = []
+        for label, _ in AGING_BUCKETS:
+            count, body, percent = figures.get(label, (0, Decimal("0"), Decimal("0")))
+            buckets.append(
+                AgingBucket(bucket=label, credits=count, outstanding_body=body, outstanding_percent=percent)
+            )
+        return buckets
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.cache import TTLCache, clear_on_commit, report_cache
+from src.core.config import get_settings
+from src.core.database import SessionLocal
+from src.models.report_cache_version import ReportCacheVersion
+
+logger = logging.getLogger(__name__)
+
+
+async def invalidate_reports(session: AsyncSession) -> None:
+    """
+    Call in a transaction that changes report results: bumps the shared version in the same
+    transaction and clears this worker's cache once it commits. Other workers clear theirs
+    when their ReportVersionWatcher sees the new version.
+    """
+    await session.execute(
+        update(ReportCacheVersion).where(ReportCacheVersion.id == 1).values(version=ReportCacheVersion.version + 1)
+    )
+    clear_on_commit(report_cache, session)
+
+
+class ReportVersionWatcher:
+    """
+    Polls report_cache_version on the primary every interval seconds and clears the cache
+    when another worker committed a write, so invalidation reaches every worker within the
+    interval instead of waiting for the TTL.
+    """
+
+    def __init__(self, cache: TTLCache, interval: float):
+        self.cache = cache
+        self.interval = interval
+        self.version: int | None = None
+        self._task: asyncio.Task | None = None
+
+    async def check(self) -> None:
+        async with SessionLocal() as session:
+            version = await session.scalar(select(ReportCacheVersion.version).where(ReportCacheVersion.id == 1))
+        if self.version is not None and version != self.version:
+            self.cache.clear()
+        self.version = version
+
+    async def run(self) -> None:
+        """Background loop started by the app lifespan."""
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.check()
+            except Exception:
+                # without the version other workers' writes go unnoticed: drop what may be stale
+                logger.exception("Reading the report cache version failed, clearing the report cache")
+                self.cache.clear()
+
+    async def start(self) -> None:
+        try:
+            await self.check()
+        except Exception:
+            logger.exception("Reading the report cache version at startup failed")
+        self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+
+report_version_watcher = ReportVersionWatcher(report_cache, get_settings().report_cache_check_interval)
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+from typing import Iterable
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.credit import Credit
+from src.models.daily_totals import DailyIssuanceTotal, DailyPaymentTotal
+from src.models.payment import Payment
+from src.services.report_versions import invalidate_reports
+
+
+class RollupsService:
+    """
+    Keeps daily_issuance_totals / daily_payment_totals in step with credits and payments.
+    Writers call record_credits / record_payments in the same transaction as their insert;
+    rebuild recomputes a date range from the raw tables. Each of them clears the report
+    cache once the transaction commits.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def record_credits(self, rows: Iterable[dict]) -> None:
+        """rows: inserted credits with issuance_date and body."""
+        totals: dict[date, list] = defaultdict(lambda: [0, Decimal("0")])
+        for row in rows:
+            day_totals = totals[row["issuance_date"]]
+            day_totals[0] += 1
+            day_totals[1] += Decimal(row["body"])
+        if not totals:
+            return
+
+        await invalidate_reports(self.session)
+        stmt = mysql_insert(DailyIssuanceTotal).values(
+            [{"day": day, "issuance_count": count, "issuance_sum": amount} for day, (count, amount) in totals.items()]
+        )
+        await self.session.execute(
+            stmt.on_duplicate_key_update(
+                issuance_count=DailyIssuanceTotal.issuance_count + stmt.inserted.issuance_count,
+                issuance_sum=DailyIssuanceTotal.issuance_sum + stmt.inserted.issuance_sum,
+            )
+        )
+
+    async def record_payments(self, rows: Iterable[dict]) -> None:
+        """rows: inserted payments with payment_date and sum."""
+        totals: dict[date, list] = defaultdict(lambda: [0, Decimal("0")])
+        for row in rows:
+            day_totals = totals[row["payment_date"]]
+            day_totals[0] += 1
+            day_totals[1] += Decimal(row["sum"])
+        if not totals:
+            return
+
+        await invalidate_reports(self.session)
+        stmt = mysql_insert(DailyPaymentTotal).values(
+            [{"day": day, "payment_count": count, "payment_sum": amount} for day, (count, amount) in totals.items()]
+        )
+        await self.session.execute(
+            stmt.on_duplicate_key_update(
+                payment_count=DailyPaymentTotal.payment_count + stmt.inserted.payment_count,
+                payment_sum=DailyPaymentTotal.payment_sum + stmt.inserted.payment_sum,
+            )
+        )
+
+    async def rebuild(self, start: date | None = None, end: date | None = None) -> None:
+        """Recompute both rollups for [start, end] (whole history when omitted) from the raw tables."""
+        await invalidate_reports(self.session)
+        await self.session.execute(_in_range(delete(DailyIssuanceTotal), DailyIssuanceTotal.day, start, end))
+        await self.session.execute(_in_range(delete(DailyPaymentTotal), DailyPaymentTotal.day, start, end))
+
+        await self.session.execute(
+            insert(DailyIssuanceTotal).from_select(
+                ["day", "issuance_count", "issuance_sum"],
+                _in_range(
+                    select(Credit.issuance_date, func.count(), func.sum(Credit.body)),
+                    Credit.issuance_date,
+                    start,
+                    end,
+                ).group_by(Credit.issuance_date),
+            )
+        )
+        await self.session.execute(
+            insert(DailyPaymentTotal).from_select(
+                ["day", "payment_count", "payment_sum"],
+                _in_range(
+                    select(Payment.payment_date, func.count(), func.sum(Payment.sum)),
+                    Payment.payment_date,
+                    start,
+                    end,
+                ).group_by(Payment.payment_date),
+            )
+        )
+
+
+def _in_range(stmt, column, start: date | None, end: date | None):
+    if start is not None:
+        stmt = stmt.where(column >= start)
+    if end is not None:
+        stmt = stmt.where(column <= end)
+    return stmt